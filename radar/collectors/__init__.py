@@ -1,3 +0,0 @@
-from . import clinicaltrials
-from . import sec_edgar
-from . import patentsview
@@ -1,8 +1,12 @@
 from __future__ import annotations
-import requests
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
-from typing import Any, Dict, List, Optional, Tuple
-from radar.models import NormalizedSignal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from radar import jsonutil
+from radar.net import build_session
+from radar.models import NormalizedSignal, StudySnapshot
 
 DEFAULT_FIELDS = [
     "protocolSection.identificationModule.nctId",
@@ -16,21 +20,26 @@ DEFAULT_FIELDS = [
     "protocolSection.sponsorCollaboratorsModule.collaborators.class",
 ]
 
-def fetch_studies(
+# Shared keep-alive session: page N+1 reuses the TCP/TLS connection of page N.
+_SESSION = build_session(accept="application/json")
+
+def fetch_study_pages(
     base_url: str,
     query_term: str,
     page_size: int = 200,
     max_pages: int = 50,
     max_studies: int = 10000,
-) -> List[Dict[str, Any]]:
-    """Fetch studies from ClinicalTrials.gov API v2 with pagination.
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield pages of studies from ClinicalTrials.gov API v2.
 
     The API returns a `nextPageToken` in responses; pass it back as `pageToken`
-    to retrieve subsequent pages.
+    to retrieve subsequent pages. Tokens are opaque, so pages cannot be requested
+    concurrently; instead every page goes over the same pooled connection. The
+    next page is only requested once the caller is done with the current one.
     """
-    studies: List[Dict[str, Any]] = []
     page_token: str | None = None
     pages = 0
+    seen = 0
 
     while True:
         params = {
@@ -44,48 +53,164 @@ def fetch_studies(
             params["pageToken"] = page_token
 
         url = f"{base_url}?{urlencode(params)}"
-        r = requests.get(url, timeout=60)
+        r = _SESSION.get(url, timeout=60)
         r.raise_for_status()
-        blob = r.json() or {}
+        blob = jsonutil.loads(r.content) or {}
         batch = blob.get("studies", []) or []
-        studies.extend(batch)
+        if max_studies is not None:
+            # Trim the page that crosses the cap.
+            batch = batch[:max(0, max_studies - seen)]
+        seen += len(batch)
 
         page_token = blob.get("nextPageToken")
         pages += 1
+        # Only `batch` outlives the page; release the decoded page before yielding it.
+        del blob, r
+
+        if batch:
+            yield batch
+        del batch
 
         if not page_token:
             break
         if max_pages is not None and pages >= max_pages:
             break
-        if max_studies is not None and len(studies) >= max_studies:
-            studies = studies[:max_studies]
+        if max_studies is not None and seen >= max_studies:
             break
 
-    return studies
 
+def fetch_studies(
+    base_url: str,
+    query_term: str,
+    page_size: int = 200,
+    max_pages: int = 50,
+    max_studies: int = 10000,
+) -> Iterator[Dict[str, Any]]:
+    """Studies from fetch_study_pages, one at a time; at most one page is held in memory."""
+    for page in fetch_study_pages(base_url, query_term, page_size, max_pages, max_studies):
+        yield from page
 
-def normalize_study(study: Dict[str, Any], source: str = "clinicaltrials") -> Tuple[Optional[str], NormalizedSignal, Dict[str, Any]]:
-    ps = study.get("protocolSection", {}) or {}
-    ident = ps.get("identificationModule", {}) or {}
-    status = ps.get("statusModule", {}) or {}
-    design = ps.get("designModule", {}) or {}
-    sc = ps.get("sponsorCollaboratorsModule", {}) or {}
 
-    lead = sc.get("leadSponsor", {}) or {}
+_DONE = object()
+
+def fetch_query_pages(
+    base_url: str,
+    queries: Iterable[str],
+    page_size: int = 200,
+    max_pages: int = 50,
+    max_studies: int = 10000,
+    workers: int = 3,
+    prefetch: int = 2,
+) -> Iterator[Tuple[str, Iterator[List[Dict[str, Any]]]]]:
+    """fetch_study_pages for several queries at once, handed back in query order.
+
+    Yields (query, pages) pairs. Each query's pages are fetched on a worker
+    thread, at most `prefetch` pages ahead of the caller, so the round trips of
+    different queries overlap while the caller still sees every page of query 1,
+    then query 2, and so on. Drain each `pages` before advancing to the next
+    pair. A fetch error is raised from `pages` where it happened in that order.
+    Closing the generator stops the workers.
+    """
+    queries = list(queries)
+    if not queries:
+        return
+    stop = threading.Event()
+
+    def put(out: "queue.Queue[Any]", item: Any) -> bool:
+        # Bounded wait so a worker notices stop while the caller is not reading.
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce(query_term: str, out: "queue.Queue[Any]") -> None:
+        try:
+            for page in fetch_study_pages(base_url, query_term, page_size, max_pages, max_studies):
+                if not put(out, page):
+                    return
+        except Exception as e:
+            put(out, e)
+        else:
+            put(out, _DONE)
+
+    def drain(out: "queue.Queue[Any]") -> Iterator[List[Dict[str, Any]]]:
+        while True:
+            item = out.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    outs: List["queue.Queue[Any]"] = [queue.Queue(maxsize=max(1, prefetch)) for _ in queries]
+    ex = ThreadPoolExecutor(max_workers=max(1, min(workers, len(queries))))
+    try:
+        # Submitted in query order, so the queries the caller reaches first are
+        # the ones already running.
+        for q, out in zip(queries, outs):
+            ex.submit(produce, q, out)
+        for q, out in zip(queries, outs):
+            yield q, drain(out)
+    finally:
+        stop.set()
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+# Sponsor classes (INDUSTRY, OTHER, NIH, ...) and overall statuses (RECRUITING, ...)
+# are small closed vocabularies; upper-case each distinct spelling once and share
+# the result.
+_UPPER: Dict[str, str] = {"": ""}
+
+def _upper(v: Optional[str]) -> str:
+    v = v or ""
+    u = _UPPER.get(v)
+    if u is None:
+        u = _UPPER[v] = v.upper()
+    return u
+
+def quick_fields(study: Dict[str, Any]) -> Tuple[str, str, bool]:
+    """(overall status, lead sponsor class, has an INDUSTRY collaborator) off the raw study.
+
+    Status and classes are upper-cased as in normalize_study, so ingest can drop
+    filtered-out studies before building their signal and snapshot.
+    """
+    ps = study.get("protocolSection") or {}
+    status = _upper((ps.get("statusModule") or {}).get("overallStatus"))
+    sc = ps.get("sponsorCollaboratorsModule") or {}
+    lead_class = _upper((sc.get("leadSponsor") or {}).get("class"))
+    has_industry_collab = any(
+        isinstance(c, dict) and c.get("name") and _upper(c.get("class")) == "INDUSTRY"
+        for c in sc.get("collaborators") or ()
+    )
+    return status, lead_class, has_industry_collab
+
+def normalize_study(study: Dict[str, Any], source: str = "clinicaltrials") -> Tuple[Optional[str], NormalizedSignal, StudySnapshot]:
+    # `.get(k) or {}` rather than `.get(k, {}) or {}`: same result without building a
+    # throwaway default dict per lookup; this runs once per study.
+    ps = study.get("protocolSection") or {}
+    ident = ps.get("identificationModule") or {}
+    status = ps.get("statusModule") or {}
+    design = ps.get("designModule") or {}
+    sc = ps.get("sponsorCollaboratorsModule") or {}
+
+    lead = sc.get("leadSponsor") or {}
     lead_name = lead.get("name") or "UNKNOWN"
-    lead_class = (lead.get("class") or "").upper()
+    lead_class = _upper(lead.get("class"))
 
-    collaborators = sc.get("collaborators", []) or []
-    collab_list: List[Dict[str, str]] = []
-    for c in collaborators:
-        if isinstance(c, dict) and c.get("name"):
-            collab_list.append({"name": c.get("name"), "class": (c.get("class") or "").upper()})
+    collab_list: List[Dict[str, str]] = [
+        {"name": n, "class": _upper(c.get("class"))}
+        for c in sc.get("collaborators") or ()
+        if isinstance(c, dict) and (n := c.get("name"))
+    ]
 
     nct_id = ident.get("nctId")
     title = ident.get("briefTitle")
     overall_status = status.get("overallStatus")
-    last_update = (status.get("lastUpdatePostDateStruct", {}) or {}).get("date")
-    phases = design.get("phases", []) or []
+    last_update = (status.get("lastUpdatePostDateStruct") or {}).get("date")
+    phases = design.get("phases") or []
 
     evidence_url = f"https://clinicaltrials.gov/study/{nct_id}" if nct_id else None
 
@@ -107,13 +232,13 @@ def normalize_study(study: Dict[str, Any], source: str = "clinicaltrials") -> Tu
         payload=payload,
     )
 
-    study_blob = {
-        "brief_title": title,
-        "overall_status": overall_status,
-        "phases": phases,
-        "last_update_posted": last_update,
-        "sponsor_class": lead_class,
-        "study_url": evidence_url,
-        "raw": study,
-    }
+    study_blob = StudySnapshot(
+        brief_title=title,
+        overall_status=overall_status,
+        phases=phases,
+        last_update_posted=last_update,
+        sponsor_class=lead_class,
+        study_url=evidence_url,
+        raw=study,
+    )
     return nct_id, sig, study_blob
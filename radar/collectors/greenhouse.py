@@ -1,35 +1,65 @@
 from __future__ import annotations
-import requests
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from radar import jsonutil
 from radar.models import NormalizedSignal
+from radar.net import build_session
 
-def fetch_jobs(board_token: str) -> List[Dict[str, Any]]:
+DETAIL_WORKERS = 16
+
+_SESSION = build_session(pool_maxsize=DETAIL_WORKERS)
+
+def fetch_jobs(board_token: str, content: bool = True) -> List[Dict[str, Any]]:
+    # content=true inlines each job's description, so most boards need no per-job detail calls.
     url = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs"
-    r = requests.get(url, timeout=60)
+    r = _SESSION.get(url, params={"content": "true"} if content else None, timeout=60)
     r.raise_for_status()
-    return r.json().get("jobs", [])
+    return jsonutil.loads(r.content).get("jobs", [])
 
 def fetch_job_detail(board_token: str, job_id: int) -> Optional[Dict[str, Any]]:
     # Greenhouse job detail endpoint
     url = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs/{job_id}"
     try:
-        r = requests.get(url, timeout=60)
+        r = _SESSION.get(url, timeout=60)
         if r.status_code != 200:
             return None
-        return r.json()
+        return jsonutil.loads(r.content)
     except Exception:
         return None
 
-def normalize_job(job: Dict[str, Any], company_name: str, board_token: str, source: str = "greenhouse") -> NormalizedSignal:
+def enrich_jobs(
+    board_token: str,
+    jobs: List[Dict[str, Any]],
+    max_workers: int = DETAIL_WORKERS,
+) -> List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """Pair each job with its detail record, fetching concurrently only where content is missing."""
+    need = [j for j in jobs if "content" not in j and j.get("id") is not None]
+    details: Dict[Any, Optional[Dict[str, Any]]] = {}
+    if need:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(need)))) as ex:
+            for j, d in zip(need, ex.map(lambda j: fetch_job_detail(board_token, j["id"]), need)):
+                details[j["id"]] = d
+    return [(j, details.get(j.get("id"))) for j in jobs]
+
+def build_signal(
+    job: Dict[str, Any],
+    detail: Optional[Dict[str, Any]],
+    company_name: str,
+    source: str = "greenhouse",
+    keep_detail: bool = False,
+) -> NormalizedSignal:
+    """Only text_blob is read downstream; the detail record is stored only with keep_detail."""
     title = job.get("title") or ""
-    job_id = job.get("id")
-    detail = fetch_job_detail(board_token, job_id) if job_id is not None else None
     content = ""
     if isinstance(detail, dict):
         content = detail.get("content") or ""
-    payload = dict(job)
-    payload["detail"] = detail
-    payload["text_blob"] = f"{title}\n{content}".strip()
+    elif "content" in job:
+        content = job.get("content") or ""
+    payload = {
+        **job,
+        "detail": detail if keep_detail else None,
+        "text_blob": f"{title}\n{content}".strip() if content else title.strip(),
+    }
     return NormalizedSignal(
         account_name=company_name,
         signal_type="job_posting",
@@ -39,3 +69,23 @@ def normalize_job(job: Dict[str, Any], company_name: str, board_token: str, sour
         published_at=job.get("updated_at") or job.get("created_at"),
         payload=payload,
     )
+
+def normalize_jobs(
+    jobs: List[Dict[str, Any]],
+    company_name: str,
+    board_token: str,
+    source: str = "greenhouse",
+    keep_detail: bool = False,
+) -> List[NormalizedSignal]:
+    return [build_signal(j, d, company_name, source, keep_detail) for j, d in enrich_jobs(board_token, jobs)]
+
+def normalize_job(
+    job: Dict[str, Any],
+    company_name: str,
+    board_token: str,
+    source: str = "greenhouse",
+    keep_detail: bool = False,
+) -> NormalizedSignal:
+    job_id = job.get("id")
+    detail = fetch_job_detail(board_token, job_id) if job_id is not None else None
+    return build_signal(job, detail, company_name, source, keep_detail)
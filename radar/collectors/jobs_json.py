@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from radar import jsonutil
 from radar.models import NormalizedSignal
 
 def _iso(dt: Any) -> Optional[str]:
@@ -19,8 +19,8 @@ def _iso(dt: Any) -> Optional[str]:
     return None
 
 def load_jobs(path: str) -> List[Dict[str, Any]]:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(path, "rb") as f:
+        data = jsonutil.loads(f.read())
     if isinstance(data, list):
         return data
     if isinstance(data, dict) and isinstance(data.get("jobs"), list):
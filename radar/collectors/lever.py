@@ -1,37 +1,51 @@
 from __future__ import annotations
-import requests
 from typing import Any, Dict, List
+from radar import jsonutil
 from radar.models import NormalizedSignal
+from radar.net import build_session
 
-import datetime as dt
+from functools import lru_cache
+import time
+
+_SESSION = build_session()
+
+
+@lru_cache(maxsize=4096)
+def _epoch_to_iso(ms_int: int) -> str | None:
+    # Lever timestamps are typically epoch milliseconds
+    if ms_int > 10_000_000_000:  # > ~2286-11-20 in seconds, so must be ms
+        secs, frac_us = divmod(ms_int, 1000)
+        frac_us *= 1000
+    else:
+        secs, frac_us = ms_int, 0
+    t = time.gmtime(secs)
+    if not 1 <= t.tm_year <= 9999:
+        return None
+    # Same text as datetime.fromtimestamp(ts, tz=utc).isoformat(), without the datetime.
+    if frac_us:
+        return "%04d-%02d-%02dT%02d:%02d:%02d.%06d+00:00" % (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec, frac_us)
+    return "%04d-%02d-%02dT%02d:%02d:%02d+00:00" % (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec)
 
 
 def _ms_to_iso(ms: int | str | None) -> str | None:
     if ms is None:
         return None
     try:
-        ms_int = int(ms)
-        # Lever timestamps are typically epoch milliseconds
-        if ms_int > 10_000_000_000:  # > ~2286-11-20 in seconds, so must be ms
-            ts = ms_int / 1000.0
-        else:
-            ts = float(ms_int)
-        return dt.datetime.fromtimestamp(ts, tz=dt.timezone.utc).isoformat()
+        return _epoch_to_iso(int(ms))
     except Exception:
         return None
 
 
 def fetch_jobs(lever_account: str) -> List[Dict[str, Any]]:
     url = f"https://api.lever.co/v0/postings/{lever_account}?mode=json"
-    r = requests.get(url, timeout=60)
+    r = _SESSION.get(url, timeout=60)
     r.raise_for_status()
-    return r.json()
+    return jsonutil.loads(r.content)
 
 def normalize_job(job: Dict[str, Any], company_name: str, source: str = "lever") -> NormalizedSignal:
     title = job.get("text") or ""
     description = job.get("description") or ""
-    payload = dict(job)
-    payload["text_blob"] = f"{title}\n{description}".strip()
+    payload = {**job, "text_blob": f"{title}\n{description}".strip() if description else title.strip()}
     return NormalizedSignal(
         account_name=company_name,
         signal_type="job_posting",
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import datetime as dt
 import json
-import re
-import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 import requests
 
+from radar import jsonutil
 from radar.models import NormalizedSignal
+from radar.net import Throttle, build_session
+from radar.textmatch import keyword_hits as _keyword_hits
 
 PATENTSVIEW_QUERY_URL = "https://api.patentsview.org/patents/query"
 
+_SESSION = build_session(accept="application/json")
+
+# Shared across threads, so concurrent companies don't multiply the request rate.
+_THROTTLE = Throttle()
+
 DEFAULT_KEYWORDS = [
     "CAR-T", "chimeric antigen receptor", "T cell engager", "CD3", "bispecific",
     "TCR-T", "T cell receptor", "cell therapy", "adoptive cell",
@@ -23,32 +30,20 @@ class PatentsConfig:
     recent_window_days: int = 365
     max_patents_per_company: int = 10
     request_delay_s: float = 0.2
+    # Caller-owned session; None uses the module pool.
+    session: Optional[requests.Session] = field(default=None, repr=False, compare=False)
 
-def _norm(s: str) -> str:
-    s = (s or "").lower()
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    return re.sub(r"\s+", " ", s).strip()
-
-def _within_days(date_str: str, window_days: int) -> bool:
+def _within_days(date_str: str, window_days: int, now: Optional[dt.datetime] = None) -> bool:
     try:
-        import datetime as dt
         d = dt.datetime.fromisoformat(date_str)
         if d.tzinfo is None:
             d = d.replace(tzinfo=dt.timezone.utc)
-        now = dt.datetime.now(dt.timezone.utc)
+        if now is None:
+            now = dt.datetime.now(dt.timezone.utc)
         return (now - d).days <= window_days
     except Exception:
         return False
 
-def _keyword_hits(text: str, keywords: List[str]) -> List[str]:
-    t = _norm(text)
-    hits = []
-    for k in keywords:
-        kk = _norm(k)
-        if kk and kk in t:
-            hits.append(k)
-    return hits
-
 def _query(company_name: str, cfg: PatentsConfig) -> Dict[str, Any]:
     # Build PatentsView boolean query: assignee contains company name AND text_any on title/abstract
     # Note: PatentsView query syntax uses JSON in 'q' parameter.
@@ -66,10 +61,10 @@ def _query(company_name: str, cfg: PatentsConfig) -> Dict[str, Any]:
         "patent_abstract", "assignees.assignee_organization"
     ]
     params = {"q": json.dumps(q), "f": json.dumps(f), "o": json.dumps({"per_page": cfg.max_patents_per_company})}
-    time.sleep(cfg.request_delay_s)
-    r = requests.get(PATENTSVIEW_QUERY_URL, params=params, timeout=60)
+    _THROTTLE.wait(cfg.request_delay_s)
+    r = (cfg.session or _SESSION).get(PATENTSVIEW_QUERY_URL, params=params, timeout=60)
     r.raise_for_status()
-    return r.json()
+    return jsonutil.loads(r.content)
 
 def ingest_patents(company_name: str, cfg: PatentsConfig) -> List[NormalizedSignal]:
     try:
@@ -77,6 +72,7 @@ def ingest_patents(company_name: str, cfg: PatentsConfig) -> List[NormalizedSign
     except Exception:
         return []
     pats = data.get("patents") or []
+    now = dt.datetime.now(dt.timezone.utc)
     sigs: List[NormalizedSignal] = []
     for p in pats:
         num = p.get("patent_number")
@@ -85,7 +81,7 @@ def ingest_patents(company_name: str, cfg: PatentsConfig) -> List[NormalizedSign
         abstract = (p.get("patent_abstract") or "").strip()
         if not num or not date:
             continue
-        if not _within_days(date, cfg.recent_window_days):
+        if not _within_days(date, cfg.recent_window_days, now):
             continue
 
         blob = f"{title}\n{abstract}"
@@ -1,20 +1,32 @@
 from __future__ import annotations
 
-import json
+import codecs
+import datetime as dt
+import functools
 import os
 import re
-import time
-from dataclasses import dataclass
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import requests
 
+from radar import jsonutil
 from radar.models import NormalizedSignal
+from radar.net import Throttle, build_session
+from radar.textmatch import matchable_keyword_count, max_keyword_len, normalized_hits, norm as _norm
 
 SEC_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
 SEC_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
 
+# Shared keep-alive pool for tickers, submissions and filing documents. Headers stay
+# per-request since the User-Agent comes from config.
+_SESSION = build_session()
+
 DEFAULT_KEYWORDS = [
     "car-t", "car t", "chimeric antigen receptor",
     "t cell engager", "t-cell engager", "cd3", "bispecific",
@@ -30,96 +42,248 @@ class SecConfig:
     max_filings_per_company: int = 5
     min_keyword_hits: int = 1
     request_delay_s: float = 0.2
+    max_workers: int = 2
+    # Stop streaming a filing document after this many (decompressed) bytes; 0 reads
+    # it all. See _scan_filing for what a cap costs in recall.
+    max_document_bytes: int = 0
     cache_path: Path = Path(__file__).resolve().parents[2] / "data" / "sec_company_tickers.json"
+    # Caller-owned session (e.g. one sized for its own concurrency); None uses the module pool.
+    session: Optional[requests.Session] = field(default=None, repr=False, compare=False)
+
+def _session(cfg: SecConfig) -> requests.Session:
+    return cfg.session or _SESSION
 
 def _ua(cfg: SecConfig) -> Dict[str, str]:
     # SEC requires a descriptive User-Agent with contact info.
     return {"User-Agent": cfg.user_agent, "Accept-Encoding": "gzip, deflate", "Accept": "application/json"}
 
-def _norm(s: str) -> str:
-    s = (s or "").lower()
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    return re.sub(r"\s+", " ", s).strip()
+# SEC request starts stay request_delay_s apart across every thread and company.
+_THROTTLE = Throttle()
 
 def _download_tickers(cfg: SecConfig) -> Dict[str, Any]:
     cfg.cache_path.parent.mkdir(parents=True, exist_ok=True)
     if cfg.cache_path.exists():
         try:
-            return json.loads(cfg.cache_path.read_text(encoding="utf-8"))
+            return jsonutil.loads(cfg.cache_path.read_bytes())
         except Exception:
             pass
-    r = requests.get(SEC_TICKERS_URL, headers=_ua(cfg), timeout=60)
+    r = _session(cfg).get(SEC_TICKERS_URL, headers=_ua(cfg), timeout=60)
     r.raise_for_status()
-    data = r.json()
-    cfg.cache_path.write_text(json.dumps(data), encoding="utf-8")
+    data = jsonutil.loads(r.content)
+    # Write to a temp file in the same directory and rename it into place, so a
+    # reader never sees a half-written cache.
+    fd, tmp = tempfile.mkstemp(dir=cfg.cache_path.parent, prefix=cfg.cache_path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(jsonutil.dumps(data))
+        os.replace(tmp, cfg.cache_path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
     return data
 
-def _best_cik_for_company(company_name: str, tickers: Dict[str, Any]) -> Optional[str]:
-    # company_tickers.json is a dict keyed by integer strings with {"cik_str","ticker","title"}
+@dataclass
+class _TickerIndex:
+    """Normalized company_tickers.json as parallel arrays, built once per cache file.
+
+    Lookups never re-tokenize titles: candidates come from the inverted token
+    index and are scored by intersecting prebuilt frozensets.
+    """
+    ciks: List[str] = field(default_factory=list)
+    titles: List[str] = field(default_factory=list)
+    tokens: List[FrozenSet[str]] = field(default_factory=list)
+    # token -> entry positions, ascending (file order is the tie-break).
+    by_token: Dict[str, List[int]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, tickers: Dict[str, Any]) -> "_TickerIndex":
+        # company_tickers.json is a dict keyed by integer strings with {"cik_str","ticker","title"}
+        idx = cls()
+        for _, rec in tickers.items():
+            title = _norm(rec.get("title",""))
+            if not title:
+                continue
+            i = len(idx.titles)
+            tset = frozenset(title.split())
+            idx.ciks.append(str(rec.get("cik_str")))
+            idx.titles.append(title)
+            idx.tokens.append(tset)
+            for tok in tset:
+                idx.by_token.setdefault(tok, []).append(i)
+        return idx
+
+@functools.lru_cache(maxsize=4)
+def _load_ticker_index(cache_path: Path, mtime_ns: Optional[int], user_agent: str) -> _TickerIndex:
+    cfg = SecConfig(user_agent=user_agent, keywords=[], cache_path=cache_path)
+    return _TickerIndex.build(_download_tickers(cfg))
+
+# Companies are looked up from several threads (ingest.company_workers); the first
+# download and index build happen once, with the other threads waiting on it.
+_TICKERS_LOCK = threading.Lock()
+
+def _ticker_index(cfg: SecConfig) -> _TickerIndex:
+    # Keyed on the cache file's mtime so a refreshed company_tickers.json is re-indexed.
+    with _TICKERS_LOCK:
+        if not cfg.cache_path.exists():
+            _download_tickers(cfg)
+        try:
+            mtime_ns: Optional[int] = cfg.cache_path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        return _load_ticker_index(cfg.cache_path, mtime_ns, cfg.user_agent)
+
+def _best_cik_for_company(company_name: str, index: _TickerIndex) -> Optional[str]:
     target = _norm(company_name)
+    sset = frozenset(target.split())
     best = None
     best_score = 0
-    for _, rec in tickers.items():
-        title = _norm(rec.get("title",""))
-        if not title:
-            continue
-        # very simple token overlap
-        tset = set(title.split())
-        sset = set(target.split())
-        score = len(tset & sset)
+    # very simple token overlap, scored only over titles sharing at least one token
+    candidates = sorted({i for tok in sset for i in index.by_token.get(tok, ())})
+    for i in candidates:
+        score = len(index.tokens[i] & sset)
         if score > best_score:
             best_score = score
-            best = str(rec.get("cik_str"))
+            best = index.ciks[i]
     if best and best_score >= 2:
         return best.zfill(10)
     # fallback: try substring match
-    for _, rec in tickers.items():
-        title = _norm(rec.get("title",""))
-        if target and title and (target in title or title in target):
-            return str(rec.get("cik_str")).zfill(10)
+    if target:
+        for title, cik in zip(index.titles, index.ciks):
+            if target in title or title in target:
+                return cik.zfill(10)
     return None
 
-def _within_days(date_str: str, window_days: int) -> bool:
-    try:
-        import datetime as dt
-        d = dt.datetime.fromisoformat(date_str)
-        if d.tzinfo is None:
-            d = d.replace(tzinfo=dt.timezone.utc)
-        now = dt.datetime.now(dt.timezone.utc)
-        return (now - d).days <= window_days
-    except Exception:
-        return False
+def _window_start(window_days: int) -> str:
+    """Earliest filingDate (ISO, UTC) inside the recent window.
+
+    filingDate is a plain YYYY-MM-DD, so the window test is a string compare
+    against this instead of a datetime parse per filing.
+    """
+    return (dt.datetime.now(dt.timezone.utc).date() - dt.timedelta(days=window_days)).isoformat()
 
 def _fetch_submissions(cfg: SecConfig, cik10: str) -> Dict[str, Any]:
-    time.sleep(cfg.request_delay_s)
-    r = requests.get(SEC_SUBMISSIONS_URL.format(cik=cik10), headers=_ua(cfg), timeout=60)
+    _THROTTLE.wait(cfg.request_delay_s)
+    r = _session(cfg).get(SEC_SUBMISSIONS_URL.format(cik=cik10), headers=_ua(cfg), timeout=60)
     r.raise_for_status()
-    return r.json()
+    return jsonutil.loads(r.content)
 
 def _filing_doc_url(cik_int: int, accession: str, primary_doc: str) -> str:
     # accession in submissions includes dashes, remove them for path
     acc_nodash = accession.replace("-", "")
     return f"https://www.sec.gov/Archives/edgar/data/{cik_int}/{acc_nodash}/{primary_doc}"
 
+_RE_SCRIPT = re.compile(r"<script[\s\S]*?</script>", re.I)
+_RE_STYLE = re.compile(r"<style[\s\S]*?</style>", re.I)
+_RE_TAG = re.compile(r"<[^>]+>")
+_RE_NBSP = re.compile(r"&nbsp;|&#160;")
+
+def _strip_tags(html: str) -> str:
+    html = _RE_SCRIPT.sub(" ", html)
+    html = _RE_STYLE.sub(" ", html)
+    html = _RE_TAG.sub(" ", html)
+    return _RE_NBSP.sub(" ", html)
+
 def _strip_html(html: str) -> str:
-    html = re.sub(r"<script[\s\S]*?</script>", " ", html, flags=re.I)
-    html = re.sub(r"<style[\s\S]*?</style>", " ", html, flags=re.I)
-    html = re.sub(r"<[^>]+>", " ", html)
-    html = re.sub(r"&nbsp;|&#160;", " ", html)
-    return re.sub(r"\s+", " ", html).strip()
-
-def _keyword_hits(text: str, keywords: List[str]) -> List[str]:
-    t = _norm(text)
-    hits = []
-    for k in keywords:
-        kk = _norm(k)
-        if kk and kk in t:
-            hits.append(k)
-    return hits
+    # str.split() collapses whitespace runs in C; much cheaper than a \s+ sub on MB-sized filings.
+    return " ".join(_strip_tags(html).split())
+
+EXCERPT_CHARS = 500
+_STREAM_CHUNK = 64 * 1024
+
+def _safe_cut(buf: str) -> int:
+    """Length of the prefix of `buf` that can be stripped on its own.
+
+    Ends at the last '>' so no tag is split, and before any <script>/<style>
+    block whose closing tag hasn't arrived yet.
+    """
+    cut = buf.rfind(">") + 1
+    if cut:
+        low = buf[:cut].lower()
+        for tag in ("script", "style"):
+            i = low.rfind("<" + tag)
+            if i >= 0 and low.find("</" + tag + ">", i) < 0:
+                cut = min(cut, i)
+    return cut
+
+def _scan_filing(evidence_url: str, cfg: SecConfig) -> Tuple[List[str], Optional[str]]:
+    """Stream a filing document and keyword-scan it; returns (hits, excerpt).
+
+    The body is stripped and scanned a segment at a time, up to
+    cfg.max_document_bytes (0: the whole document). Every keyword found in that
+    text is returned (the caller stores them as matched_keywords), so the
+    download only stops early once all keywords have matched and the excerpt is
+    filled.
+
+    A cap trades recall for bandwidth: large 10-K/20-F documents are inline
+    XBRL, and their first megabyte or so is mostly the hidden XBRL header
+    rather than business text, so a small cap can miss filings that only
+    mention a keyword further in.
+    """
+    total = matchable_keyword_count(cfg.keywords)
+    overlap = max_keyword_len(cfg.keywords)
+    found: Set[str] = set()
+    head = ""  # tag-stripped text, uncollapsed, until the excerpt is settled
+    excerpt: Optional[str] = None
+    tail = ""
+
+    def feed(segment: str) -> bool:
+        nonlocal head, excerpt, tail
+        # Segments end on a tag boundary, so stripping them one by one and
+        # concatenating gives exactly the tag-stripped document.
+        raw = _strip_tags(segment)
+        if excerpt is None:
+            head += raw
+            collapsed = " ".join(head.split())
+            if len(collapsed) >= EXCERPT_CHARS:
+                excerpt, head = collapsed[:EXCERPT_CHARS], ""
+        if len(found) < total and (t := _norm(raw)):
+            # The tail of the previous segments catches keywords spanning the boundary.
+            window = f"{tail} {t}" if tail else t
+            found.update(normalized_hits(window, cfg.keywords, skip=found))
+            tail = window[-overlap:] if overlap else ""
+        return len(found) >= total and excerpt is not None
+
+    try:
+        _THROTTLE.wait(cfg.request_delay_s)
+        with _session(cfg).get(
+            evidence_url,
+            headers={"User-Agent": cfg.user_agent, "Accept": "text/html"},
+            timeout=60,
+            stream=True,
+        ) as r:
+            if not r.ok:
+                return [], None
+            decoder = codecs.getincrementaldecoder(r.encoding or "utf-8")(errors="replace")
+            buf = ""
+            read = 0
+            done = False
+            for chunk in r.iter_content(chunk_size=_STREAM_CHUNK):
+                read += len(chunk)
+                buf += decoder.decode(chunk)
+                cut = _safe_cut(buf)
+                if cut:
+                    done = feed(buf[:cut])
+                    buf = buf[cut:]
+                if done or (cfg.max_document_bytes and read >= cfg.max_document_bytes):
+                    break
+            else:
+                # Whole document read: flush whatever followed the last tag.
+                buf += decoder.decode(b"", final=True)
+                if buf:
+                    feed(buf)
+    except Exception:
+        pass
+    if not found:
+        return [], None
+    if excerpt is None:
+        excerpt = " ".join(head.split())
+    return [k for k in cfg.keywords if k in found], excerpt
 
 def ingest_sec_filings(company_name: str, cfg: SecConfig) -> List[NormalizedSignal]:
-    tickers = _download_tickers(cfg)
-    cik10 = _best_cik_for_company(company_name, tickers)
+    cik10 = _best_cik_for_company(company_name, _ticker_index(cfg))
     if not cik10:
         return []
 
@@ -135,63 +299,59 @@ def ingest_sec_filings(company_name: str, cfg: SecConfig) -> List[NormalizedSign
 
     allowed_forms = {"8-K", "10-Q", "10-K", "20-F", "6-K", "F-1", "S-1"}
 
-    sigs: List[NormalizedSignal] = []
-    for form, fdate, acc, pdoc, rdate, desc in list(zip(forms, dates, accessions, primary_docs, report_dates, descriptions))[:200]:
+    window_start = _window_start(cfg.recent_window_days)
+    candidates = []
+    for form, fdate, acc, pdoc, rdate, desc in islice(zip(forms, dates, accessions, primary_docs, report_dates, descriptions), 200):
         if form not in allowed_forms:
             continue
-        if not fdate or not _within_days(fdate, cfg.recent_window_days):
+        if not fdate or fdate[:10] < window_start:
             continue
         if not acc or not pdoc:
             continue
+        candidates.append((form, fdate, acc, pdoc, rdate, desc))
 
-        evidence_url = _filing_doc_url(cik_int, acc, pdoc)
-        title = f"{form} filed {fdate}" + (f" – {desc}" if desc else "")
-        text_blob = title
-
-        # Optional: fetch and keyword-scan document (bounded)
-        hits: List[str] = []
-        excerpt = None
-        if len(sigs) < cfg.max_filings_per_company:
-            try:
-                time.sleep(cfg.request_delay_s)
-                r = requests.get(evidence_url, headers={"User-Agent": cfg.user_agent, "Accept": "text/html"}, timeout=60)
-                if r.ok and r.text:
-                    txt = _strip_html(r.text)
-                    hits = _keyword_hits(txt, cfg.keywords)
-                    if hits:
-                        excerpt = txt[:500]
-                        text_blob = f"{title}\n{excerpt}"
-            except Exception:
-                pass
-
-        # If keyword filtering enabled, require hits
-        if cfg.min_keyword_hits > 0 and len(hits) < cfg.min_keyword_hits:
-            continue
+    sigs: List[NormalizedSignal] = []
+    # Fetch documents in batches sized to the signals still needed; the
+    # throttle keeps the combined request rate at the sequential pace.
+    with ThreadPoolExecutor(max_workers=max(1, cfg.max_workers)) as ex:
+        pos = 0
+        while pos < len(candidates) and len(sigs) < cfg.max_filings_per_company:
+            batch = candidates[pos:pos + cfg.max_filings_per_company - len(sigs)]
+            pos += len(batch)
+            urls = [_filing_doc_url(cik_int, acc, pdoc) for _, _, acc, pdoc, _, _ in batch]
+            scans = ex.map(lambda u: _scan_filing(u, cfg), urls)
+            for (form, fdate, acc, pdoc, rdate, desc), evidence_url, (hits, excerpt) in zip(batch, urls, scans):
+                title = f"{form} filed {fdate}" + (f" – {desc}" if desc else "")
+                text_blob = f"{title}\n{excerpt}" if excerpt else title
+
+                # If keyword filtering enabled, require hits
+                if cfg.min_keyword_hits > 0 and len(hits) < cfg.min_keyword_hits:
+                    continue
+
+                payload = {
+                    "cik": cik10,
+                    "form": form,
+                    "filing_date": fdate,
+                    "report_date": rdate,
+                    "accession": acc,
+                    "primary_document": pdoc,
+                    "description": desc,
+                    "matched_keywords": hits,
+                    "excerpt": excerpt,
+                    "text_blob": text_blob,
+                }
+
+                sigs.append(NormalizedSignal(
+                    account_name=company_name,
+                    signal_type="sec_filing",
+                    source="sec_edgar",
+                    title=title,
+                    evidence_url=evidence_url,
+                    published_at=fdate,
+                    payload=payload,
+                ))
 
-        payload = {
-            "cik": cik10,
-            "form": form,
-            "filing_date": fdate,
-            "report_date": rdate,
-            "accession": acc,
-            "primary_document": pdoc,
-            "description": desc,
-            "matched_keywords": hits,
-            "excerpt": excerpt,
-            "text_blob": text_blob,
-        }
-
-        sigs.append(NormalizedSignal(
-            account_name=company_name,
-            signal_type="sec_filing",
-            source="sec_edgar",
-            title=title,
-            evidence_url=evidence_url,
-            published_at=fdate,
-            payload=payload,
-        ))
-
-        if len(sigs) >= cfg.max_filings_per_company:
-            break
+                if len(sigs) >= cfg.max_filings_per_company:
+                    break
 
     return sigs
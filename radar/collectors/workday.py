@@ -1,12 +1,88 @@
 from __future__ import annotations
 
-import json
+import codecs
+import math
 import os
+import re
 import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlencode, urlsplit
 
+import requests
+from urllib3.util.retry import Retry
+
+from radar import jsonutil
 from radar.models import NormalizedSignal
+from radar.net import HostLimiter, build_session
+
+# Concurrent requests per tenant; Workday's WAF starts rejecting well above these.
+DETAIL_CONCURRENCY = 8
+PAGE_CONCURRENCY = 4
+# In-process requests in flight per Workday host, shared by concurrent
+# fetch_jobs calls (several companies on one tenant host, or one board fetched
+# from several threads).
+HOST_CONCURRENCY = 8
+
+# (tenant, site, wd_host) -> tokens the scraper discovered from the landing page
+# ({"tenant", "site", "origin"}); later calls for the same board skip discovery.
+_DISCOVERED: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+
+# (tenant, site, externalPath) -> job detail JSON, or _GONE when the endpoint
+# answered 404/410, so a board scraped again in the same process only requests
+# postings it hasn't seen. Other failures are not cached and get retried.
+# Oldest entries are evicted past DETAIL_CACHE_MAX. fetch_jobs may run on several
+# threads at once, so every read and write goes through _DETAILS_LOCK.
+DETAIL_CACHE_MAX = 4096
+_DETAILS: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+_DETAILS_LOCK = threading.Lock()
+_GONE = object()
+_GONE_STATUSES = (404, 410)
+
+# jobs list URL -> index of the listing request variant (A/B/C) that last worked.
+_PAGE_VARIANT: Dict[str, int] = {}
+
+_UA = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+_JSON_HEADERS = {
+    "Accept": "application/json,text/plain,*/*",
+    "Accept-Language": "de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+_POST_HEADERS = {**_JSON_HEADERS, "Content-Type": "application/json", "X-Requested-With": "XMLHttpRequest"}
+
+# The listing POSTs are read-only searches, so they are retried like GETs.
+_SESSION = build_session(
+    pool_maxsize=max(DETAIL_CONCURRENCY, PAGE_CONCURRENCY),
+    retry_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+)
+_LIMITER = HostLimiter(HOST_CONCURRENCY)
+_SESSION.headers["User-Agent"] = _UA
+
+# Same patterns, order and landing-page byte cap as scripts/workday_scrape.mjs.
+_CXS_TOKEN_RES = (
+    re.compile(r"""/wday/cxs/([^/]+)/([^/"'?\s]+)"""),
+    re.compile(r"""\\/wday\\/cxs\\/([^\\/]+)\\/([^\\"'?\s]+)"""),
+    re.compile(r"""https://[^\s"']+/wday/cxs/([^/]+)/([^/"'?\s]+)"""),
+    re.compile(r"""https:\\/\\/[^\s"']+\\/wday\\/cxs\\/([^\\/]+)\\/([^\\"'?\s]+)"""),
+)
+_LANDING_MAX_BYTES = 512 * 1024
+_TIMEOUT = 60
+
+@dataclass(frozen=True)
+class WorkdayCtx:
+    """URL parts of one resolved board, built once and shared by all of its postings."""
+    tenant: str
+    site: str
+    origin: str
+    cxs_base: str
+    board_url: str
+
+    @classmethod
+    def for_board(cls, tenant: str, site: str, origin: str) -> "WorkdayCtx":
+        return cls(tenant, site, origin, f"{origin}/wday/cxs/{tenant}/{site}", f"{origin}/{site}")
 
 def _node_bin() -> str:
     return os.environ.get("NODE_BIN", "node")
@@ -17,9 +93,237 @@ def _script_path() -> str:
     repo_root = Path(__file__).resolve().parents[2]  # .../<repo>/<repo>
     return str(repo_root / "scripts" / "workday_scrape.mjs")
 
-def fetch_jobs(tenant: str, site: str, wd_host: str, limit: int = 50, max_pages: int = 20) -> List[Dict[str, Any]]:
-    """Fetch Workday job postings using the bundled Node scraper (more tenant-compatible)."""
-    host = f"{tenant}.{wd_host}.myworkdayjobs.com"
+def _extract_tokens(html: str) -> Optional[Tuple[str, str]]:
+    for rx in _CXS_TOKEN_RES:
+        m = rx.search(html)
+        if m:
+            return m.group(1), m.group(2)
+    return None
+
+def _landing_tokens(url: str) -> Optional[Tuple[str, Optional[Tuple[str, str]]]]:
+    """(final url, tokens) for a landing page, reading only as much of it as needed."""
+    with _LIMITER.slot(url), _SESSION.get(url, headers={"Accept": "text/html"}, stream=True, timeout=_TIMEOUT) as r:
+        if not r.ok:
+            return None
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        text = ""
+        size = 0
+        for chunk in r.iter_content(8192):
+            size += len(chunk)
+            text += decoder.decode(chunk)
+            # The plain pattern wins in _extract_tokens, so a complete match in a
+            # prefix is the one a full read would find.
+            m = _CXS_TOKEN_RES[0].search(text)
+            if m and m.end() < len(text):
+                return r.url, (m.group(1), m.group(2))
+            if size >= _LANDING_MAX_BYTES:
+                break
+        else:
+            text += decoder.decode(b"", final=True)
+        return r.url, _extract_tokens(text)
+
+def _discover(host: str, site: str) -> Optional[Dict[str, str]]:
+    for u in (f"https://{host}/{site}", f"https://{host}/en-US/{site}", f"https://{host}/en-us/{site}"):
+        try:
+            got = _landing_tokens(u)
+        except requests.RequestException:
+            continue
+        if got and got[1]:
+            parts = urlsplit(got[0])
+            return {"tenant": got[1][0], "site": got[1][1], "origin": f"{parts.scheme}://{parts.netloc}"}
+    return None
+
+def _fetch_json(url: str, method: str = "GET", body: Optional[Dict[str, Any]] = None) -> Tuple[bool, int, Any, str]:
+    with _LIMITER.slot(url):
+        if body is None:
+            r = _SESSION.request(method, url, headers=_JSON_HEADERS, timeout=_TIMEOUT)
+        else:
+            r = _SESSION.request(method, url, headers=_POST_HEADERS, data=jsonutil.dumps(body), timeout=_TIMEOUT)
+    try:
+        data = jsonutil.loads(r.content)
+    except ValueError:
+        data = None
+    return r.ok, r.status_code, data, r.text[:500] if data is None else ""
+
+def _has_postings(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("jobPostings"), list)
+
+def _request_variant(variant: int, list_url: str, offset: int, limit: int, search_text: str) -> Tuple[bool, int, Any, str]:
+    if variant == 0:
+        # A) GET params
+        params = urlencode({"offset": offset, "limit": limit, "searchText": search_text})
+        return _fetch_json(f"{list_url}?{params}")
+    # B) POST with searchText, C) POST with query
+    key = "searchText" if variant == 1 else "query"
+    return _fetch_json(list_url, "POST", {"appliedFacets": {}, key: search_text, "limit": limit, "offset": offset})
+
+def _get_page(list_url: str, offset: int, limit: int, search_text: str) -> Dict[str, Any]:
+    # Start with the variant that last worked for this board; the others are tried
+    # in the usual A/B/C order only if it stops returning postings.
+    first = _PAGE_VARIANT.get(list_url, 0)
+    for variant in (first, *(v for v in range(3) if v != first)):
+        ok, status, data, text = _request_variant(variant, list_url, offset, limit, search_text)
+        if ok and _has_postings(data):
+            _PAGE_VARIANT[list_url] = variant
+            return data
+    msg = jsonutil.dumps(data) if data is not None else text
+    raise RuntimeError(f"Workday jobs fetch failed HTTP {status} {list_url} :: {msg}")
+
+def _get_page_settled(list_url: str, offset: int, limit: int, search_text: str) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
+    try:
+        return _get_page(list_url, offset, limit, search_text), None
+    except (requests.RequestException, RuntimeError) as e:
+        return None, e
+
+def _fetch_all_pages(list_url: str, page_size: int, max_pages: int, search_text: str, concurrency: int) -> List[Dict[str, Any]]:
+    """Same walk as fetchAllPages in the Node scraper: first page, then the pages its
+    `total` implies (or speculative windows) in parallel, consumed in order and
+    deduplicated by externalPath."""
+    jobs: List[Dict[str, Any]] = []
+    seen: Set[str] = set()
+    fetched = 0
+
+    def consume(results) -> bool:
+        nonlocal fetched
+        for page, err in results:
+            if err is not None:
+                raise err
+            postings = page.get("jobPostings") or []
+            fetched += 1
+            if not postings:
+                return True
+            # Postings shift across page boundaries when the board changes mid-walk.
+            for j in postings:
+                path = j.get("externalPath")
+                if path:
+                    if path in seen:
+                        continue
+                    seen.add(path)
+                jobs.append(j)
+            if len(postings) < page_size:
+                return True
+        return False
+
+    if max_pages <= 0:
+        return jobs
+    first = _get_page_settled(list_url, 0, page_size, search_text)
+    if consume([first]):
+        return jobs
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        def fetch_pages(count: int):
+            offsets = [(fetched + k) * page_size for k in range(max(0, min(count, max_pages - fetched)))]
+            return list(ex.map(lambda off: _get_page_settled(list_url, off, page_size, search_text), offsets))
+
+        total = first[0].get("total")
+        window = concurrency
+        if isinstance(total, (int, float)) and not isinstance(total, bool) and total > 0:
+            if consume(fetch_pages(math.ceil(total / page_size) - 1)):
+                return jobs
+            window = 1
+        while fetched < max_pages:
+            if consume(fetch_pages(window)):
+                return jobs
+    return jobs
+
+def _detail_url(ctx: WorkdayCtx, external_path: str) -> Optional[str]:
+    if not external_path or "/job/" not in external_path:
+        return None
+    slug = external_path.split("/job/")[1].lstrip("/")
+    if not slug:
+        return None
+    return ctx.cxs_base + "/job/" + slug
+
+def _fetch_detail(url: str) -> Any:
+    """Detail JSON, _GONE for a definite 404/410, or None for any other failure."""
+    try:
+        ok, status, data, _ = _fetch_json(url)
+    except requests.RequestException:
+        return None
+    if status in _GONE_STATUSES:
+        return _GONE
+    return data if ok else None
+
+def _fetch_details(ctx: WorkdayCtx, paths: List[str], concurrency: int) -> Dict[str, Any]:
+    """externalPath -> detail JSON for the postings whose detail could be fetched."""
+    out: Dict[str, Any] = {}
+    todo: Dict[str, str] = {}
+    with _DETAILS_LOCK:
+        hits = {p: _DETAILS.get((ctx.tenant, ctx.site, p)) for p in paths}
+    for p, hit in hits.items():
+        if hit is _GONE:
+            continue
+        if hit is not None:
+            out[p] = hit
+        elif p not in todo:
+            url = _detail_url(ctx, p)
+            if url:
+                todo[p] = url
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(todo)))) as ex:
+            for p, d in zip(todo, ex.map(_fetch_detail, todo.values())):
+                if d is None:
+                    continue
+                if d is not _GONE:
+                    out[p] = d
+                with _DETAILS_LOCK:
+                    _DETAILS[(ctx.tenant, ctx.site, p)] = d
+                    while len(_DETAILS) > DETAIL_CACHE_MAX:
+                        _DETAILS.popitem(last=False)
+    return out
+
+def _description(detail: Any) -> str:
+    if not isinstance(detail, dict):
+        return ""
+    info = detail.get("jobPostingInfo")
+    desc = ""
+    if isinstance(info, dict):
+        desc = info.get("jobDescription") or info.get("externalDescription") or ""
+    return desc or detail.get("jobDescription") or ""
+
+def _fetch_python(
+    host: str,
+    tenant: str,
+    site: str,
+    limit: int,
+    max_pages: int,
+    detail_concurrency: int,
+    page_concurrency: int,
+    known: Optional[Dict[str, str]],
+) -> Dict[str, Any]:
+    """In-process port of scripts/workday_scrape.mjs; returns the same {"discovered", "jobs"} shape."""
+    found = known or _discover(host, site) or {}
+    ctx = WorkdayCtx.for_board(
+        found.get("tenant") or tenant,
+        found.get("site") or site,
+        found.get("origin") or f"https://{host}",
+    )
+
+    raw_jobs = _fetch_all_pages(ctx.cxs_base + "/jobs", limit, max_pages, "", page_concurrency)
+    paths = [j.get("externalPath") or "" for j in raw_jobs]
+    by_path = _fetch_details(ctx, paths, detail_concurrency)
+
+    jobs = [
+        {
+            "title": j.get("title") or j.get("externalTitle") or j.get("postedTitle") or "",
+            "postedOn": j.get("postedOn") or j.get("postedDate"),
+            "externalPath": p,
+            "description": _description(by_path.get(p)),
+        }
+        for j, p in zip(raw_jobs, paths)
+    ]
+    return {"discovered": {"tenant": ctx.tenant, "site": ctx.site, "origin": ctx.origin}, "jobs": jobs}
+
+def _fetch_node(
+    host: str,
+    tenant: str,
+    site: str,
+    limit: int,
+    max_pages: int,
+    detail_concurrency: int,
+    page_concurrency: int,
+    known: Optional[Dict[str, str]],
+) -> Dict[str, Any]:
     script = _script_path()
     if not os.path.exists(script):
         raise RuntimeError(f"Workday node scraper missing at {script}. Make sure scripts/workday_scrape.mjs exists in repo root.")
@@ -29,25 +333,76 @@ def fetch_jobs(tenant: str, site: str, wd_host: str, limit: int = 50, max_pages:
         script,
         "--company", tenant,
         "--host", host,
-        "--tenant", tenant,
-        "--site", site,
+        "--tenant", known["tenant"] if known else tenant,
+        "--site", known["site"] if known else site,
         "--pageSize", str(limit),
         "--maxPages", str(max_pages),
         "--fetchDetails", "true",
+        "--detailConcurrency", str(max(1, detail_concurrency)),
+        "--pageConcurrency", str(max(1, page_concurrency)),
     ]
+    if known:
+        cmd += ["--discover", "false", "--origin", known["origin"]]
     try:
-        p = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=180)
+        # stdout stays bytes: jsonutil parses them directly, no str round-trip.
+        p = subprocess.run(cmd, capture_output=True, check=True, timeout=180)
     except subprocess.CalledProcessError as e:
-        out = ((e.stderr or "") + "\n" + (e.stdout or ""))[:800]
+        out = ((e.stderr or b"") + b"\n" + (e.stdout or b""))[:800].decode("utf-8", "replace")
         raise RuntimeError(f"Workday node scraper failed: {out}") from e
     except subprocess.TimeoutExpired as e:
         raise RuntimeError("Workday node scraper timed out") from e
+    return jsonutil.loads(p.stdout)
+
+# Backend name -> fetchers tried in order. Every fetcher but the last hands over
+# to the next when it raises or finds no jobs; the last one's result or error is
+# final. "auto" keeps the Node scraper (more tenant-compatible) first and falls
+# back to the in-process port, e.g. when node isn't installed.
+# RADAR_WORKDAY_BACKEND overrides the default.
+_BACKENDS: Dict[str, Tuple[Callable[..., Dict[str, Any]], ...]] = {
+    "auto": (_fetch_node, _fetch_python),
+    "python": (_fetch_python,),
+    "node": (_fetch_node,),
+}
+BACKENDS = tuple(_BACKENDS)
+
+def fetch_jobs(
+    tenant: str,
+    site: str,
+    wd_host: str,
+    limit: int = 50,
+    max_pages: int = 20,
+    detail_concurrency: int = DETAIL_CONCURRENCY,
+    page_concurrency: int = PAGE_CONCURRENCY,
+    backend: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch Workday job postings with the fetchers of `backend` (see _BACKENDS)."""
+    backend = backend or os.environ.get("RADAR_WORKDAY_BACKEND") or "auto"
+    fetchers = _BACKENDS.get(backend)
+    if fetchers is None:
+        raise ValueError(f"Unknown Workday backend {backend!r}; expected one of {BACKENDS}")
+    host = f"{tenant}.{wd_host}.myworkdayjobs.com"
+    key = (tenant, site, wd_host)
+    known = _DISCOVERED.get(key)
+    args = (host, tenant, site, limit, max_pages, detail_concurrency, page_concurrency, known)
 
-    data = json.loads(p.stdout)
+    *fallible, last = fetchers
+    data: Optional[Dict[str, Any]] = None
+    for fetch in fallible:
+        try:
+            data = fetch(*args)
+        # OSError covers requests errors and a missing node binary.
+        except (RuntimeError, OSError):
+            continue
+        if data.get("jobs"):
+            break
+    else:
+        data = last(*args)
     jobs = data.get("jobs") or []
 
     postings: List[Dict[str, Any]] = []
     disc = data.get("discovered") or {}
+    if not known and disc.get("tenant") and disc.get("site") and disc.get("origin"):
+        _DISCOVERED[key] = {"tenant": disc["tenant"], "site": disc["site"], "origin": disc["origin"]}
     for j in jobs:
         postings.append({
             "title": j.get("title"),
@@ -60,14 +415,27 @@ def fetch_jobs(tenant: str, site: str, wd_host: str, limit: int = 50, max_pages:
         })
     return postings
 
-def normalize_job(job: Dict[str, Any], company_name: str, tenant: str, site: str, wd_host: str, source: str = "workday") -> NormalizedSignal:
+def _ctx_for_job(job: Dict[str, Any], tenant: str, site: str, wd_host: str) -> WorkdayCtx:
+    return WorkdayCtx.for_board(tenant, site, job.get("_origin") or f"https://{tenant}.{wd_host}.myworkdayjobs.com")
+
+def normalize_job(
+    job: Dict[str, Any],
+    company_name: str,
+    tenant: str,
+    site: str,
+    wd_host: str,
+    source: str = "workday",
+    ctx: Optional[WorkdayCtx] = None,
+) -> NormalizedSignal:
+    """`ctx` is the job's board as returned by fetch_jobs; normalize_jobs builds it once per board."""
+    if ctx is None:
+        ctx = _ctx_for_job(job, tenant, site, wd_host)
     title = job.get("title") or job.get("externalTitle") or job.get("postedTitle") or ""
     external_path = job.get("externalPath") or ""
-    origin = job.get("_origin") or f"https://{tenant}.{wd_host}.myworkdayjobs.com"
     if isinstance(external_path, str) and external_path.startswith("/"):
-        evidence_url = f"{origin}{external_path}"
+        evidence_url = ctx.origin + external_path
     else:
-        evidence_url = f"{origin}/{site}"
+        evidence_url = ctx.board_url
 
     posted_on = job.get("postedOn") or job.get("postedDate")
     description = job.get("_description") or ""
@@ -89,3 +457,22 @@ def normalize_job(job: Dict[str, Any], company_name: str, tenant: str, site: str
         published_at=str(posted_on) if posted_on is not None else None,
         payload=payload,
     )
+
+def normalize_jobs(
+    jobs: List[Dict[str, Any]],
+    company_name: str,
+    tenant: str,
+    site: str,
+    wd_host: str,
+    source: str = "workday",
+) -> List[NormalizedSignal]:
+    # Postings from one fetch_jobs call share an origin, so this is one ctx per call.
+    ctxs: Dict[Optional[str], WorkdayCtx] = {}
+    out = []
+    for j in jobs:
+        key = j.get("_origin")
+        ctx = ctxs.get(key)
+        if ctx is None:
+            ctx = ctxs[key] = _ctx_for_job(j, tenant, site, wd_host)
+        out.append(normalize_job(j, company_name, tenant, site, wd_host, source, ctx))
+    return out
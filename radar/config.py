@@ -1,14 +1,18 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Sequence, Tuple
 import yaml
 
 ROOT = Path(__file__).resolve().parents[1]
 
+# libyaml's loader when PyYAML was built with it; same safe subset, parsed in C.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def load_yaml(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    with path.open("rb") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
 
 @dataclass(frozen=True)
 class AppConfig:
@@ -16,52 +20,96 @@ class AppConfig:
     companies: Dict[str, Any]
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def load() -> "AppConfig":
+        """Parse config/ once per process; later calls return the same instance."""
         cfg = load_yaml(ROOT / "config" / "config.yaml")
         cos = load_yaml(ROOT / "config" / "companies.yaml")
         return AppConfig(config=cfg, companies=cos)
 
+    # Sections and derived collections are built once per instance; cached_property
+    # stores into the instance __dict__ directly, so it works on the frozen dataclass.
+    # List settings come back as tuples so callers can't mutate the shared copy.
+    @cached_property
+    def _ctg(self) -> Dict[str, Any]:
+        return self.config.get("ctg", {})
+
+    @cached_property
+    def _exports(self) -> Dict[str, Any]:
+        return self.config.get("exports", {})
+
+    @cached_property
+    def _aliases(self) -> Dict[str, str]:
+        return self.config.get("normalization", {}).get("aliases", {})
+
+    @cached_property
+    def _companies(self) -> Tuple[Dict[str, Any], ...]:
+        return tuple((self.companies or {}).get("companies", []))
+
+    @cached_property
+    def _company_names(self) -> frozenset[str]:
+        return frozenset(c.get("name","").strip() for c in self._companies if c.get("name"))
+
+    @cached_property
+    def _ctg_queries(self) -> Tuple[str, ...]:
+        return tuple(self._ctg.get("ctg_queries", []))
+
+    @cached_property
+    def _ctg_keep_statuses(self) -> Tuple[str, ...]:
+        return tuple(self._ctg.get("keep_statuses", []))
+
+    @cached_property
+    def _ctg_keep_sponsor_classes(self) -> Tuple[str, ...]:
+        return tuple(self._ctg.get("keep_sponsor_classes", []))
+
+    @cached_property
+    def _ctg_high_urgency_phases(self) -> Tuple[str, ...]:
+        return tuple(self._ctg.get("high_urgency_phases", []))
+
     def ctg_base_url(self) -> str:
-        return self.config.get("ctg", {}).get("base_url")
+        return self._ctg.get("base_url")
 
     def ctg_page_size(self) -> int:
-        return int(self.config.get("ctg", {}).get("page_size", 200))
+        return int(self._ctg.get("page_size", 200))
 
-    def ctg_queries(self) -> List[str]:
-        return self.config.get("ctg", {}).get("ctg_queries", [])
+    def ctg_queries(self) -> Sequence[str]:
+        return self._ctg_queries
 
-    def ctg_keep_statuses(self) -> List[str]:
-        return self.config.get("ctg", {}).get("keep_statuses", [])
+    def ctg_keep_statuses(self) -> Sequence[str]:
+        return self._ctg_keep_statuses
 
-    def ctg_keep_sponsor_classes(self) -> List[str]:
-        return self.config.get("ctg", {}).get("keep_sponsor_classes", [])
+    def ctg_keep_sponsor_classes(self) -> Sequence[str]:
+        return self._ctg_keep_sponsor_classes
 
-    def ctg_high_urgency_phases(self) -> List[str]:
-        return self.config.get("ctg", {}).get("high_urgency_phases", [])
+    def ctg_high_urgency_phases(self) -> Sequence[str]:
+        return self._ctg_high_urgency_phases
 
     def ctg_include_industry_collaborators(self) -> bool:
-        return bool(self.config.get("ctg", {}).get("include_industry_collaborators", True))
+        return bool(self._ctg.get("include_industry_collaborators", True))
 
     def aliases(self) -> Dict[str, str]:
-        return self.config.get("normalization", {}).get("aliases", {})
+        return self._aliases
 
     def export_top_n(self) -> int:
-        return int(self.config.get("exports", {}).get("top_n", 40))
+        return int(self._exports.get("top_n", 40))
 
     def export_csv_path(self) -> str:
-        return self.config.get("exports", {}).get("out_csv", "exports/latest_top40.csv")
+        return self._exports.get("out_csv", "exports/latest_top40.csv")
 
     def export_json_path(self) -> str:
-        return self.config.get("exports", {}).get("out_json", "exports/latest_top40.json")
+        return self._exports.get("out_json", "exports/latest_top40.json")
 
     def export_watchlist_csv_path(self) -> str:
-        return self.config.get("exports", {}).get("watchlist_csv", "exports/latest_watchlist.csv")
+        return self._exports.get("watchlist_csv", "exports/latest_watchlist.csv")
 
     def export_watchlist_json_path(self) -> str:
-        return self.config.get("exports", {}).get("watchlist_json", "exports/latest_watchlist.json")
+        return self._exports.get("watchlist_json", "exports/latest_watchlist.json")
+
+    def export_compact_json(self) -> bool:
+        return bool(self._exports.get("compact_json", False))
 
-    def companies_list(self) -> List[Dict[str, Any]]:
-        return (self.companies or {}).get("companies", [])
+    def companies_list(self) -> Sequence[Dict[str, Any]]:
+        return self._companies
 
-    def company_names_set(self) -> set[str]:
-        return {c.get("name","").strip() for c in self.companies_list() if c.get("name")}
+    def company_names_set(self) -> frozenset[str]:
+        return self._company_names
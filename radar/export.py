@@ -2,9 +2,45 @@ from __future__ import annotations
 
 import csv, json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence, Tuple, Union
+from radar.models import ExportRow
+from radar.profiling import profiled
+from radar.role_recommender import roles_for_text
 from radar.roles import DEFAULT_ROLE_TITLES
 
+# Serialized once; most rows fall back to the default role list.
+_DEFAULT_ROLES_JSON = json.dumps(DEFAULT_ROLE_TITLES)
+
+# Row keys copied as-is into the CSVs, in column order.
+_RANKED_KEYS = (
+    "account_name","fit","urgency","total","fit_reason","urgency_reason","urgency_source",
+    "trigger_summary",
+    "best_fit_trial_title","best_fit_trial_status","best_fit_trial_phase","best_fit_trial_url",
+    "best_urgency_trial_title","best_urgency_trial_status","best_urgency_trial_phase","best_urgency_trial_url",
+)
+_WATCHLIST_KEYS = (
+    "account_name","fit","urgency","total","fit_reason","urgency_reason","urgency_source",
+    "trigger_summary",
+)
+
+# Rows arrive as ExportRow from update_scores_and_export; plain dicts are still accepted.
+Row = Union[ExportRow, Dict[str, Any]]
+
+def _as_dict(r: Row) -> Dict[str, Any]:
+    return r.to_dict() if isinstance(r, ExportRow) else r
+
+def _roles_json(roles: Any) -> str:
+    return json.dumps(roles) if roles else _DEFAULT_ROLES_JSON
+
+def _write_json(path: Path, rows: List[Dict[str, Any]], compact: bool = False) -> None:
+    # json.dump writes encoder chunks as they are produced instead of first
+    # building the whole document as one string.
+    with path.open("w", encoding="utf-8") as f:
+        if compact:
+            json.dump(rows, f, separators=(",", ":"))
+        else:
+            json.dump(rows, f, indent=2)
+
 def summarize_triggers(signals: List[Dict[str, Any]], max_items: int = 3) -> str:
     parts = []
     for s in signals[:max_items]:
@@ -16,7 +52,35 @@ def summarize_triggers(signals: List[Dict[str, Any]], max_items: int = 3) -> str
             parts.append(f"{st}")
     return " | ".join(parts)
 
-def export_ranked(rows: List[Dict[str, Any]], out_csv: Path, out_json: Path, top_n: int | None = None) -> None:
+_TRIAL_SIGNAL_TYPES = frozenset({"trial_lead_sponsor", "trial_collaborator"})
+
+def summarize_and_recommend(
+    signals: List[Dict[str, Any]],
+    examples: Sequence[Dict[str, Any]] = (),
+    max_items: int = 3,
+    max_roles: int = 5,
+) -> Tuple[str, List[str]]:
+    """summarize_triggers(trial signals + examples) and recommend_roles(signals) in one walk.
+
+    Trial signals lead the summary, topped up from `examples` (the matched
+    SEC/patent items); roles come from every signal's title.
+    """
+    trials: List[Dict[str, Any]] = []
+    titles: List[str] = []
+    has_collaborator = False
+    for s in signals:
+        st = s.get("signal_type")
+        if st in _TRIAL_SIGNAL_TYPES:
+            if len(trials) < max_items:
+                trials.append(s)
+            if st == "trial_collaborator":
+                has_collaborator = True
+        titles.append(s.get("title") or "")
+    summary = summarize_triggers(trials + list(examples[:max_items]), max_items=max_items)
+    return summary, roles_for_text(" ".join(titles).lower(), has_collaborator, max_roles=max_roles)
+
+@profiled
+def export_ranked(rows: Sequence[Row], out_csv: Path, out_json: Path, top_n: int | None = None, compact: bool = False) -> None:
     out_csv = Path(out_csv)
     out_json = Path(out_json)
     out_csv.parent.mkdir(parents=True, exist_ok=True)
@@ -29,48 +93,34 @@ def export_ranked(rows: List[Dict[str, Any]], out_csv: Path, out_json: Path, top
         "target_roles",
     ]
 
-    iter_rows = (rows[:top_n] if top_n else rows)
+    # The top_n subset with ranks, built once and shared by the CSV and JSON outputs;
+    # only these rows are turned into dicts.
+    ranked = [{**_as_dict(r), "rank": i} for i, r in enumerate(rows[:top_n] if top_n else rows, start=1)]
 
-    # CSV
+    # CSV (plain writer over tuples in fieldnames order; None is written as "" like DictWriter)
     with out_csv.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for i, r in enumerate(iter_rows, start=1):
-            w.writerow({
-                "rank": i,
-                "account_name": r.get("account_name"),
-                "fit": r.get("fit"),
-                "urgency": r.get("urgency"),
-                "total": r.get("total"),
-                "fit_reason": r.get("fit_reason"),
-                "urgency_reason": r.get("urgency_reason"),
-                "urgency_source": r.get("urgency_source"),
-                "trigger_summary": r.get("trigger_summary"),
-                "best_fit_trial_title": r.get("best_fit_trial_title"),
-                "best_fit_trial_status": r.get("best_fit_trial_status"),
-                "best_fit_trial_phase": r.get("best_fit_trial_phase"),
-                "best_fit_trial_url": r.get("best_fit_trial_url"),
-                "best_urgency_trial_title": r.get("best_urgency_trial_title"),
-                "best_urgency_trial_status": r.get("best_urgency_trial_status"),
-                "best_urgency_trial_phase": r.get("best_urgency_trial_phase"),
-                "best_urgency_trial_url": r.get("best_urgency_trial_url"),
-                "sec_matched_total": (r.get("sec") or {}).get("matched_total"),
-                "patent_matched_total": (r.get("patents") or {}).get("matched_total"),
-                "target_roles": json.dumps(r.get("target_roles") or DEFAULT_ROLE_TITLES),
-            })
-
-    # JSON (mirror the same top_n subset as CSV, and include ranks).
-    json_rows: List[Dict[str, Any]] = []
-    for i, r in enumerate(iter_rows, start=1):
-        rr = dict(r)
-        rr["rank"] = i
-        json_rows.append(rr)
-    out_json.write_text(json.dumps(json_rows, indent=2), encoding="utf-8")
-
-def export_watchlist(rows: List[Dict[str, Any]], out_csv: Path, out_json: Path, top_n: int | None = None) -> None:
+        w = csv.writer(f)
+        w.writerow(fieldnames)
+        w.writerows(
+            (
+                r["rank"],
+                *map(r.get, _RANKED_KEYS),
+                (r.get("sec") or {}).get("matched_total"),
+                (r.get("patents") or {}).get("matched_total"),
+                _roles_json(r.get("target_roles")),
+            )
+            for r in ranked
+        )
+
+    # JSON (same subset and ranks as the CSV), streamed to the file.
+    _write_json(out_json, ranked, compact=compact)
+
+@profiled
+def export_watchlist(rows: Sequence[Row], out_csv: Path, out_json: Path, top_n: int | None = None, compact: bool = False) -> None:
     out_csv = Path(out_csv)
     out_json = Path(out_json)
     out_csv.parent.mkdir(parents=True, exist_ok=True)
+    rows = [_as_dict(r) for r in rows]
     fieldnames = [
         "account_name","fit","urgency","total","fit_reason","urgency_reason","urgency_source",
         "trigger_summary",
@@ -79,22 +129,17 @@ def export_watchlist(rows: List[Dict[str, Any]], out_csv: Path, out_json: Path,
         "target_roles",
     ]
     with out_csv.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
+        w = csv.writer(f)
+        w.writerow(fieldnames)
         for r in (rows[:top_n] if top_n else rows):
-            w.writerow({
-                "account_name": r.get("account_name"),
-                "fit": r.get("fit"),
-                "urgency": r.get("urgency"),
-                "total": r.get("total"),
-                "fit_reason": r.get("fit_reason"),
-                "urgency_reason": r.get("urgency_reason"),
-                "urgency_source": r.get("urgency_source"),
-                "trigger_summary": r.get("trigger_summary"),
-                "sec_matched_total": (r.get("sec") or {}).get("matched_total"),
-                "sec_examples": json.dumps((r.get("sec") or {}).get("examples")),
-                "patent_matched_total": (r.get("patents") or {}).get("matched_total"),
-                "patent_examples": json.dumps((r.get("patents") or {}).get("examples")),
-                "target_roles": json.dumps(r.get("target_roles") or DEFAULT_ROLE_TITLES),
-            })
-    out_json.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+            sec = r.get("sec") or {}
+            pats = r.get("patents") or {}
+            w.writerow((
+                *map(r.get, _WATCHLIST_KEYS),
+                sec.get("matched_total"),
+                json.dumps(sec.get("examples")),
+                pats.get("matched_total"),
+                json.dumps(pats.get("examples")),
+                _roles_json(r.get("target_roles")),
+            ))
+    _write_json(out_json, rows, compact=compact)
@@ -0,0 +1,29 @@
+"""JSON helpers that use orjson when it is installed.
+
+orjson decodes large API payloads (CT.gov pages, SEC submissions) several
+times faster than the stdlib. It is optional: without it everything falls back
+to `json` with identical results.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON from bytes or str (pass `response.content` to skip text decoding)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Encode compact JSON as str."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
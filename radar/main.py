@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import argparse
-import json
+import heapq
 import os
-from typing import Any, Dict, List, Tuple
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Any, Callable, Dict, List, Tuple
 
 from radar.config import AppConfig
 from radar import db
-from radar.collectors import clinicaltrials as ctg
-from radar.collectors import patentsview, sec_edgar
-from radar.export import export_ranked, export_watchlist, summarize_triggers
-from radar.role_recommender import recommend_roles
+from radar.export import export_ranked, export_watchlist, summarize_and_recommend
+from radar.models import ExportRow
 from radar.scoring import compute_scores
 
+# Buffered study/signal rows per executemany in ingest_trials.
+_BATCH_ROWS = 1000
+
 
 def normalize_account_name(name: str, aliases: Dict[str, str]) -> str:
     """Normalize company names using explicit alias mapping."""
@@ -22,13 +26,35 @@ def normalize_account_name(name: str, aliases: Dict[str, str]) -> str:
     return aliases.get(n, n)
 
 
+def make_normalizer(aliases: Dict[str, str]) -> Callable[[str], str]:
+    """normalize_account_name bound to `aliases`, memoized per raw name.
+
+    Sponsor and collaborator names repeat heavily across CT.gov studies, so
+    each distinct raw name is normalized once; results are interned so the
+    per-run caches keyed on them hash shared strings.
+    """
+    names: Dict[str, str] = {}
+
+    def normalize(raw: str) -> str:
+        name = names.get(raw)
+        if name is None:
+            name = names[raw] = sys.intern(normalize_account_name(raw, aliases))
+        return name
+
+    return normalize
+
+
 def ingest_trials(conn, cfg: AppConfig) -> Tuple[int, int, int]:
     """Ingest ClinicalTrials.gov studies as trial signals + study snapshots.
 
     Returns:
         (lead_sponsor_signals, collaborator_signals, collaborator_synthetic_studies)
     """
-    aliases = cfg.aliases()
+    # Collectors (and requests under them) load only in modes that fetch;
+    # export-only never pays for them.
+    from radar.collectors import clinicaltrials as ctg
+
+    account_name = make_normalizer(cfg.aliases())
     keep_statuses = {s.upper() for s in cfg.ctg_keep_statuses()}
     keep_classes = {s.upper() for s in cfg.ctg_keep_sponsor_classes()}
     include_collabs = cfg.ctg_include_industry_collaborators()
@@ -40,133 +66,159 @@ def ingest_trials(conn, cfg: AppConfig) -> Tuple[int, int, int]:
     collab_ingested = 0
     collab_attributed = 0
 
-    for q in cfg.ctg_queries():
-        ctg_cfg = cfg.config.get("ctg", {}) or {}
-        studies = ctg.fetch_studies(
-            cfg.ctg_base_url(),
-            q,
-            page_size=cfg.ctg_page_size(),
-            max_pages=int(ctg_cfg.get("max_pages", 50)),
-            max_studies=int(ctg_cfg.get("max_studies", 10000)),
-        )
-        for st in studies:
-            nct_id, sig, blob = ctg.normalize_study(st)
-            lead_name = normalize_account_name(sig.account_name, aliases)
-
-            status = (blob.get("overall_status") or "").upper()
-            if keep_statuses and status and status not in keep_statuses:
-                continue
-
-            lead_class = (blob.get("sponsor_class") or "").upper()
-            lead_allowed = (not keep_classes) or (lead_class in keep_classes)
-            collaborators = sig.payload.get("collaborators") or []
-            has_industry_collab = any(((c.get("class") or "").upper() == "INDUSTRY") for c in collaborators)
-
-            # If lead sponsor is not allowed (e.g., not INDUSTRY), optionally attribute to INDUSTRY collaborators.
-            if (not lead_allowed) and (allow_other_lead_if_industry_collab and has_industry_collab):
-                if include_collabs:
-                    for c in collaborators:
-                        cname = (c.get("name") or "").strip()
-                        cclass = (c.get("class") or "").upper()
-                        if not cname or cclass != "INDUSTRY":
+    # Each account is upserted once per run; later sightings reuse its id.
+    account_ids: Dict[str, int] = {}
+
+    def account_id_for(name: str) -> int:
+        account_id = account_ids.get(name)
+        if account_id is None:
+            account_id = account_ids[name] = db.upsert_account(conn, name, modality_tags=["car-t", "t-cell engager"])
+        return account_id
+
+    # Studies and signals are buffered and written with executemany, in
+    # _BATCH_ROWS chunks and at the end of each page.
+    study_rows: List[db.StudyRow] = []
+    signal_rows: List[db.SignalRow] = []
+
+    def flush() -> None:
+        db.upsert_studies_many(conn, study_rows)
+        db.insert_signals_many(conn, signal_rows)
+        study_rows.clear()
+        signal_rows.clear()
+
+    ctg_cfg = cfg.config.get("ctg", {}) or {}
+    # Queries are fetched concurrently, but their pages are consumed here in
+    # query order, so writes (and new account ids) follow the serial order.
+    query_pages = ctg.fetch_query_pages(
+        cfg.ctg_base_url(),
+        cfg.ctg_queries(),
+        page_size=cfg.ctg_page_size(),
+        max_pages=int(ctg_cfg.get("max_pages", 50)),
+        max_studies=int(ctg_cfg.get("max_studies", 10000)),
+        workers=max(1, int((cfg.config.get("ingest", {}) or {}).get("ctg_query_workers", 3))),
+    )
+    with closing(query_pages):
+        for _q, pages in query_pages:
+            # One transaction per page: account upserts and the page's study/signal batches
+            # commit together, and no write lock is held while the next page downloads.
+            for page in pages:
+                with conn:
+                    for st in page:
+                        if len(study_rows) >= _BATCH_ROWS or len(signal_rows) >= _BATCH_ROWS:
+                            flush()
+                        # Filter on the raw payload first; only studies that will be ingested get normalized.
+                        status, lead_class, has_industry_collab = ctg.quick_fields(st)
+                        if keep_statuses and status and status not in keep_statuses:
+                            continue
+
+                        lead_allowed = (not keep_classes) or (lead_class in keep_classes)
+                        if (not lead_allowed) and lead_class and not (allow_other_lead_if_industry_collab and has_industry_collab):
+                            continue
+
+                        nct_id, sig, blob = ctg.normalize_study(st)
+                        lead_name = account_name(sig.account_name)
+                        # INDUSTRY collaborators, normalized once and shared by both branches below.
+                        industry_collabs = [
+                            account_name(cname)
+                            for c in (sig.payload.get("collaborators") or [])
+                            if (cname := (c.get("name") or "").strip()) and c.get("class") == "INDUSTRY"
+                        ] if include_collabs else []
+
+                        # If lead sponsor is not allowed (e.g., not INDUSTRY), optionally attribute to INDUSTRY collaborators.
+                        if (not lead_allowed) and (allow_other_lead_if_industry_collab and has_industry_collab):
+                            if include_collabs:
+                                for collab_name in industry_collabs:
+                                    collab_id = account_id_for(collab_name)
+
+                                    signal_rows.append((
+                                        collab_id,
+                                        "trial_collaborator",
+                                        sig.source,
+                                        sig.title,
+                                        sig.evidence_url,
+                                        sig.published_at,
+                                        {"nct_id": nct_id, "lead_sponsor": lead_name, "lead_sponsor_class": lead_class},
+                                    ))
+                                    collab_ingested += 1
+
+                                    # Store a synthetic study row keyed by (nct_id + collaborator) so collaborator accounts receive
+                                    # trial-based scoring without colliding with studies.nct_id PK.
+                                    if nct_id:
+                                        synth_id = f"{nct_id}::collab::{collab_name}".replace(" ", "_")[:240]
+                                        study_rows.append((
+                                            synth_id,
+                                            collab_id,
+                                            blob.brief_title or "",
+                                            blob.overall_status or "",
+                                            blob.phases or [],
+                                            blob.last_update_posted,
+                                            "INDUSTRY_COLLAB",
+                                            blob.study_url,
+                                            {
+                                                "original_nct_id": nct_id,
+                                                "lead_sponsor": lead_name,
+                                                "raw": (blob.raw or {}),
+                                            },
+                                        ))
+                                        collab_attributed += 1
+                            # Skip ingesting the non-allowed lead sponsor.
                             continue
-                        collab_name = normalize_account_name(cname, aliases)
-                        collab_id = db.upsert_account(conn, collab_name, modality_tags=["car-t", "t-cell engager"])
 
-                        db.insert_signal(
-                            conn,
-                            collab_id,
-                            "trial_collaborator",
+                        # Default behavior: only ingest lead sponsor if it passes class filters (e.g., INDUSTRY).
+                        if keep_classes and lead_class and lead_class not in keep_classes:
+                            continue
+
+                        lead_id = account_id_for(lead_name)
+                        signal_rows.append((
+                            lead_id,
+                            sig.signal_type,
                             sig.source,
                             sig.title,
                             sig.evidence_url,
                             sig.published_at,
-                            {"nct_id": nct_id, "lead_sponsor": lead_name, "lead_sponsor_class": lead_class},
-                        )
-                        collab_ingested += 1
+                            sig.payload,
+                        ))
 
-                        # Store a synthetic study row keyed by (nct_id + collaborator) so collaborator accounts receive
-                        # trial-based scoring without colliding with studies.nct_id PK.
                         if nct_id:
-                            synth_id = f"{nct_id}::collab::{collab_name}".replace(" ", "_")[:240]
-                            db.upsert_study(
-                                conn,
-                                synth_id,
-                                collab_id,
-                                brief_title=blob.get("brief_title") or "",
-                                overall_status=blob.get("overall_status") or "",
-                                phases=blob.get("phases") or [],
-                                last_update_posted=blob.get("last_update_posted"),
-                                sponsor_class="INDUSTRY_COLLAB",
-                                study_url=blob.get("study_url"),
-                                raw={
-                                    "original_nct_id": nct_id,
-                                    "lead_sponsor": lead_name,
-                                    "raw": (blob.get("raw") or {}),
-                                },
-                            )
-                            collab_attributed += 1
-                # Skip ingesting the non-allowed lead sponsor.
-                continue
-
-            # Default behavior: only ingest lead sponsor if it passes class filters (e.g., INDUSTRY).
-            if keep_classes and lead_class and lead_class not in keep_classes:
-                continue
-
-            lead_id = db.upsert_account(conn, lead_name, modality_tags=["car-t", "t-cell engager"])
-            db.insert_signal(
-                conn,
-                lead_id,
-                sig.signal_type,
-                sig.source,
-                sig.title,
-                sig.evidence_url,
-                sig.published_at,
-                sig.payload,
-            )
-
-            if nct_id:
-                db.upsert_study(
-                    conn,
-                    nct_id,
-                    lead_id,
-                    brief_title=blob.get("brief_title") or "",
-                    overall_status=blob.get("overall_status") or "",
-                    phases=blob.get("phases") or [],
-                    last_update_posted=blob.get("last_update_posted"),
-                    sponsor_class=blob.get("sponsor_class"),
-                    study_url=blob.get("study_url"),
-                    raw=blob.get("raw") or {},
-                )
-
-            lead_ingested += 1
-
-            # Also ingest INDUSTRY collaborators as separate accounts (even when lead is allowed).
-            if include_collabs:
-                for c in collaborators:
-                    cname = (c.get("name") or "").strip()
-                    cclass = (c.get("class") or "").upper()
-                    if not cname or cclass != "INDUSTRY":
-                        continue
-                    collab_name = normalize_account_name(cname, aliases)
-                    collab_id = db.upsert_account(conn, collab_name, modality_tags=["car-t", "t-cell engager"])
-                    db.insert_signal(
-                        conn,
-                        collab_id,
-                        "trial_collaborator",
-                        sig.source,
-                        sig.title,
-                        sig.evidence_url,
-                        sig.published_at,
-                        {"nct_id": nct_id, "lead_sponsor": lead_name, "lead_sponsor_class": lead_class},
-                    )
-                    collab_ingested += 1
+                            study_rows.append((
+                                nct_id,
+                                lead_id,
+                                blob.brief_title or "",
+                                blob.overall_status or "",
+                                blob.phases or [],
+                                blob.last_update_posted,
+                                blob.sponsor_class,
+                                blob.study_url,
+                                blob.raw or {},
+                            ))
+
+                        lead_ingested += 1
+
+                        # Also ingest INDUSTRY collaborators as separate accounts (even when lead is allowed).
+                        if include_collabs:
+                            for collab_name in industry_collabs:
+                                collab_id = account_id_for(collab_name)
+                                signal_rows.append((
+                                    collab_id,
+                                    "trial_collaborator",
+                                    sig.source,
+                                    sig.title,
+                                    sig.evidence_url,
+                                    sig.published_at,
+                                    {"nct_id": nct_id, "lead_sponsor": lead_name, "lead_sponsor_class": lead_class},
+                                ))
+                                collab_ingested += 1
+
+                    flush()
 
     return lead_ingested, collab_ingested, collab_attributed
 
 
 def ingest_sec_and_patents(conn, cfg: AppConfig) -> int:
     """Ingest SEC filings + patents for watchlist companies."""
+    from radar.collectors import patentsview, sec_edgar
+    from radar.net import build_session
+
     aliases = cfg.aliases()
     companies = cfg.companies_list()
 
@@ -181,6 +233,8 @@ def ingest_sec_and_patents(conn, cfg: AppConfig) -> int:
         max_filings_per_company=int(sec_cfg_raw.get("max_filings_per_company", 5)),
         min_keyword_hits=int(sec_cfg_raw.get("min_keyword_hits", 1)),
         request_delay_s=float(sec_cfg_raw.get("request_delay_s", 0.25)),
+        max_workers=int(sec_cfg_raw.get("max_workers", 2)),
+        max_document_bytes=int(sec_cfg_raw.get("max_document_bytes", 0)),
     )
 
     # Patents config
@@ -192,50 +246,60 @@ def ingest_sec_and_patents(conn, cfg: AppConfig) -> int:
         request_delay_s=float(pat_raw.get("request_delay_s", 0.25)),
     )
 
-    ingested = 0
+    workers = max(1, int((cfg.config.get("ingest", {}) or {}).get("company_workers", 4)))
+    # Keep-alive pools sized for this run's fan-out, so concurrent companies never
+    # open connections the pool would then have to discard: up to `workers`
+    # companies, each with a submissions request and max_workers filing downloads.
+    sec_cfg.session = build_session(pool_maxsize=workers * (max(1, sec_cfg.max_workers) + 1))
+    pat_cfg.session = build_session(pool_maxsize=workers, accept="application/json")
 
-    for c in companies:
-        name = c.get("name")
-        if not name:
-            continue
-        account_name = normalize_account_name(name, aliases)
-        account_id = db.upsert_account(conn, account_name, modality_tags=["car-t", "t-cell engager"])
+    def fetch(account_name: str) -> Tuple[List[Any], List[Any], List[Tuple[str, Exception]]]:
+        # Runs on a worker thread: network only, no database access. Failures are
+        # returned as (source, error) rather than printed from the worker.
+        filings: List[Any] = []
+        pats: List[Any] = []
+        errors: List[Tuple[str, Exception]] = []
 
         # SEC filings
         try:
             filings = sec_edgar.ingest_sec_filings(account_name, sec_cfg)
-            for sig in filings:
-                db.insert_signal(
-                    conn,
-                    account_id,
-                    sig.signal_type,
-                    sig.source,
-                    sig.title,
-                    sig.evidence_url,
-                    sig.published_at,
-                    sig.payload,
-                )
-                ingested += 1
         except Exception as e:
-            print(f"[sec] WARN: ingest failed for {account_name}: {e}")
+            errors.append(("sec", e))
 
         # Patents
         try:
             pats = patentsview.ingest_patents(account_name, pat_cfg)
-            for sig in pats:
-                db.insert_signal(
-                    conn,
-                    account_id,
-                    sig.signal_type,
-                    sig.source,
-                    sig.title,
-                    sig.evidence_url,
-                    sig.published_at,
-                    sig.payload,
-                )
-                ingested += 1
         except Exception as e:
-            print(f"[patents] WARN: ingest failed for {account_name}: {e}")
+            errors.append(("patents", e))
+
+        return filings, pats, errors
+
+    names = [normalize_account_name(c["name"], aliases) for c in companies if c.get("name")]
+    ingested = 0
+    failures: List[Tuple[str, str, Exception]] = []
+
+    # Every watchlist account is upserted up front in one batch (in watchlist
+    # order, so new ids come out as before); the per-company writes below only
+    # insert signals.
+    with conn:
+        account_ids = db.upsert_accounts_many(conn, names, modality_tags=["car-t", "t-cell engager"])
+
+    # Companies are fetched concurrently; results come back in watchlist order and
+    # are written here, on the thread that owns the connection.
+    with sec_cfg.session, pat_cfg.session, ThreadPoolExecutor(max_workers=workers) as ex:
+        for account_name, account_id, (filings, pats, errors) in zip(names, account_ids, ex.map(fetch, names)):
+            # One transaction per company: both signal batches.
+            with conn:
+                db.insert_signals_many(conn, (
+                    (account_id, sig.signal_type, sig.source, sig.title, sig.evidence_url, sig.published_at, sig.payload)
+                    for sig in filings + pats
+                ))
+            ingested += len(filings) + len(pats)
+            failures.extend((source, account_name, e) for source, e in errors)
+
+    # Reported once the pool has drained, in watchlist order.
+    for source, account_name, e in failures:
+        print(f"[{source}] WARN: ingest failed for {account_name}: {e}")
 
     return ingested
 
@@ -243,105 +307,141 @@ def ingest_sec_and_patents(conn, cfg: AppConfig) -> int:
 def update_scores_and_export(conn, cfg: AppConfig) -> None:
     """Compute scores across *all* ingested signals, then export ranked + watchlist views."""
     aliases = cfg.aliases()
-    # Normalize watchlist names using the same alias mapping as ingestion.
-    watchlist = {normalize_account_name(n, aliases) for n in cfg.company_names_set()}
-    cur = conn.cursor()
 
     # Ensure watchlist companies exist as accounts even if they have zero signals yet.
-    for c in cfg.companies_list():
-        nm = (c.get("name") or "").strip()
-        if nm:
-            db.upsert_account(conn, normalize_account_name(nm, aliases), modality_tags=["car-t", "t-cell engager"])
-
-    rows_out: List[Dict[str, Any]] = []
-    watch_rows: List[Dict[str, Any]] = []
-
+    # Names are normalized with the same alias mapping as ingestion; the upserts
+    # hand back the ids, so watchlist membership below is an int set lookup.
+    with conn:
+        watchlist_ids = set(db.upsert_accounts_many(
+            conn,
+            [
+                normalize_account_name(nm, aliases)
+                for c in cfg.companies_list()
+                if (nm := (c.get("name") or "").strip())
+            ],
+            modality_tags=["car-t", "t-cell engager"],
+        ))
+
+    rows_out: List[ExportRow] = []
+    watch_rows: List[ExportRow] = []
+
+    # Two scans instead of four queries per account; accounts with no rows
+    # (e.g. watchlist companies not seen yet) just get empty lists.
+    trials_by_account = db.get_studies_grouped(conn, with_raw=False)
+    signals_by_account = db.get_signals_grouped(conn)
+
+    score_rows: List[db.ScoreRow] = []
+    empty_results: Dict[bool, Tuple[Dict[str, Any], str, List[str]]] = {}
     for a in db.fetch_accounts(conn):
         account_id = int(a["account_id"])
         company = a["name"]
+        in_watchlist = account_id in watchlist_ids
 
         # Trials are stored in studies table
-        cur.execute(
-            "SELECT * FROM studies WHERE account_id=? ORDER BY COALESCE(last_update_posted,'') DESC",
-            (account_id,),
-        )
-        trials = [dict(r) for r in cur.fetchall()]
-        for t in trials:
-            try:
-                t["phases"] = json.loads(t.get("phases_json") or "[]")
-            except Exception:
-                t["phases"] = []
-
-        # SEC + patents signals
-        sec_sigs = db.get_signals_for_account(conn, account_id, signal_type="sec_filing")
-        patent_sigs = db.get_signals_for_account(conn, account_id, signal_type="patent_publication")
-
-        scores = compute_scores(
-            trials,
-            sec_sigs,
-            patent_sigs,
-            cfg.config,
-            company_in_watchlist=(normalize_account_name(company, aliases) in watchlist),
-        )
+        trials = trials_by_account.get(account_id, [])
+
+        # SEC + patents signals (all_sigs is newest first, so these are too)
+        all_sigs = signals_by_account.get(account_id, [])
+        sec_sigs = [s for s in all_sigs if s["signal_type"] == "sec_filing"]
+        patent_sigs = [s for s in all_sigs if s["signal_type"] == "patent_publication"]
+
+        if trials or all_sigs:
+            scores = compute_scores(
+                trials,
+                sec_sigs,
+                patent_sigs,
+                cfg.config,
+                company_in_watchlist=in_watchlist,
+            )
+            summary, roles = summarize_and_recommend(
+                all_sigs,
+                ((scores.get("sec") or {}).get("examples") or [])
+                + ((scores.get("patents") or {}).get("examples") or []),
+                max_roles=5,
+            )
+        else:
+            # Accounts with no studies and no signals (e.g. watchlist companies not
+            # seen yet) all score alike, up to the watchlist bonus: compute once per flag.
+            cached = empty_results.get(in_watchlist)
+            if cached is None:
+                empty_scores = compute_scores([], [], [], cfg.config, company_in_watchlist=in_watchlist)
+                cached = empty_results[in_watchlist] = (
+                    empty_scores,
+                    *summarize_and_recommend(
+                        [],
+                        ((empty_scores.get("sec") or {}).get("examples") or [])
+                        + ((empty_scores.get("patents") or {}).get("examples") or []),
+                        max_roles=5,
+                    ),
+                )
+            scores, summary, roles = cached
 
-        db.set_scores(conn, account_id, scores["fit"], scores["urgency"], scores["access"], scores["total"])
+        score_rows.append((account_id, scores["fit"], scores["urgency"], scores["access"], scores["total"]))
 
-        all_sigs = db.get_signals_for_account(conn, account_id)
         evidence = [s["evidence_url"] for s in all_sigs[:8] if s.get("evidence_url")]
-        roles = recommend_roles(all_sigs, max_roles=5)
 
         best_fit_trial = scores.get("best_fit_trial") or {}
         best_urg_trial = scores.get("best_urgency_trial") or {}
+        fit_phases = best_fit_trial.get("phases")
+        urg_phases = best_urg_trial.get("phases")
 
-        row = {
+        row = ExportRow(
             # Canonical keys used by export.py
-            "account_name": company,
-            "fit": scores.get("fit"),
-            "urgency": scores.get("urgency"),
-            "access": scores.get("access", 0.0),
-            "total": scores.get("total"),
-            "fit_reason": scores.get("fit_reason"),
-            "urgency_reason": scores.get("urgency_reason"),
-            "urgency_source": scores.get("urgency_source"),
+            account_name=company,
+            fit=scores.get("fit"),
+            urgency=scores.get("urgency"),
+            access=scores.get("access", 0.0),
+            total=scores.get("total"),
+            fit_reason=scores.get("fit_reason"),
+            urgency_reason=scores.get("urgency_reason"),
+            urgency_source=scores.get("urgency_source"),
             # Only include SEC/patent items in summaries if they actually match configured keywords.
             # Trials are always included.
-            "trigger_summary": summarize_triggers(
-                [s for s in all_sigs if s.get("signal_type") in {"trial_lead_sponsor", "trial_collaborator"}]
-                + ((scores.get("sec") or {}).get("examples") or [])
-                + ((scores.get("patents") or {}).get("examples") or [])
-            ),
-            "best_fit_trial_title": best_fit_trial.get("brief_title"),
-            "best_fit_trial_status": best_fit_trial.get("overall_status"),
-            "best_fit_trial_phase": ",".join(best_fit_trial.get("phases") or []),
-            "best_fit_trial_url": best_fit_trial.get("study_url"),
-            "best_urgency_trial_title": best_urg_trial.get("brief_title"),
-            "best_urgency_trial_status": best_urg_trial.get("overall_status"),
-            "best_urgency_trial_phase": ",".join(best_urg_trial.get("phases") or []),
-            "best_urgency_trial_url": best_urg_trial.get("study_url"),
-            "sec": scores.get("sec"),
-            "patents": scores.get("patents"),
-            "target_roles": roles,
+            trigger_summary=summary,
+            best_fit_trial_title=best_fit_trial.get("brief_title"),
+            best_fit_trial_status=best_fit_trial.get("overall_status"),
+            best_fit_trial_phase=",".join(fit_phases) if fit_phases else "",
+            best_fit_trial_url=best_fit_trial.get("study_url"),
+            best_urgency_trial_title=best_urg_trial.get("brief_title"),
+            best_urgency_trial_status=best_urg_trial.get("overall_status"),
+            best_urgency_trial_phase=",".join(urg_phases) if urg_phases else "",
+            best_urgency_trial_url=best_urg_trial.get("study_url"),
+            sec=scores.get("sec"),
+            patents=scores.get("patents"),
+            target_roles=roles,
             # Backward compatible/debug keys
-            "company": company,
-            "total_score": scores.get("total"),
-            "fit_score": scores.get("fit"),
-            "urgency_score": scores.get("urgency"),
-            "access_score": scores.get("access", 0.0),
-            "evidence_links": evidence,
-            "score_details": scores.get("details"),
-        }
+            company=company,
+            total_score=scores.get("total"),
+            fit_score=scores.get("fit"),
+            urgency_score=scores.get("urgency"),
+            access_score=scores.get("access", 0.0),
+            evidence_links=evidence,
+            score_details=scores.get("details"),
+        )
 
         require_signals = bool(cfg.config.get("export", {}).get("ranked_require_signals", False))
         if (not require_signals) or (len(all_sigs) > 0) or (len(trials) > 0):
             rows_out.append(row)
-        if normalize_account_name(company, aliases) in watchlist:
+        if in_watchlist:
             watch_rows.append(row)
 
-    rows_out.sort(key=lambda r: (r.get("total") or 0.0), reverse=True)
-    watch_rows.sort(key=lambda r: (r.get("total") or 0.0), reverse=True)
+    # Every account's scores land in one executemany and a single commit.
+    with conn:
+        db.set_scores_many(conn, score_rows)
+
+    by_total = lambda r: (r.total or 0.0)
+    top_n = cfg.export_top_n()
+    if 0 < top_n < len(rows_out) // 2:
+        # Only the top_n rows are exported: a heap keeps those without sorting
+        # every account (same order as the stable sort, ties included).
+        rows_out = heapq.nlargest(top_n, rows_out, key=by_total)
+    else:
+        rows_out.sort(key=by_total, reverse=True)
+    watch_rows.sort(key=by_total, reverse=True)
 
-    export_ranked(rows_out, cfg.export_csv_path(), cfg.export_json_path(), top_n=cfg.export_top_n())
-    export_watchlist(watch_rows, cfg.export_watchlist_csv_path(), cfg.export_watchlist_json_path())
+    compact = cfg.export_compact_json()
+    export_ranked(rows_out, cfg.export_csv_path(), cfg.export_json_path(), top_n=top_n, compact=compact)
+    export_watchlist(watch_rows, cfg.export_watchlist_csv_path(), cfg.export_watchlist_json_path(), compact=compact)
 
     print("[export] wrote ranked + watchlist exports")
 
@@ -356,7 +456,7 @@ def run_daily(cfg: AppConfig) -> None:
         print(f"[daily] ingested industry-collaborator signals: {collab}")
     if bool(cfg.config.get("ctg", {}).get("allow_non_industry_lead_with_industry_collab", False)):
         print(f"[daily] attributed non-industry leads to collaborators (synthetic studies): {attributed}")
-    conn.close()
+    db.close(conn)
 
 
 def run_weekly(cfg: AppConfig) -> None:
@@ -366,7 +466,7 @@ def run_weekly(cfg: AppConfig) -> None:
     ing = ingest_sec_and_patents(conn, cfg)
     print(f"[weekly] ingested sec+patent signals: {ing}")
     update_scores_and_export(conn, cfg)
-    conn.close()
+    db.close(conn)
 
 
 def run_all(cfg: AppConfig) -> None:
@@ -385,14 +485,14 @@ def run_all(cfg: AppConfig) -> None:
     print(f"[all] ingested sec+patent signals: {other}")
 
     update_scores_and_export(conn, cfg)
-    conn.close()
+    db.close(conn)
 
 
 def run_export_only(cfg: AppConfig) -> None:
     conn = db.connect()
     db.migrate(conn)
     update_scores_and_export(conn, cfg)
-    conn.close()
+    db.close(conn)
 
 
 def main() -> None:
@@ -1,8 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedSignal:
     account_name: str
     signal_type: str
@@ -11,3 +11,50 @@ class NormalizedSignal:
     evidence_url: Optional[str]
     published_at: Optional[str]
     payload: Dict[str, Any]
+
+@dataclass(slots=True)
+class StudySnapshot:
+    """Per-study fields destined for the studies table."""
+    brief_title: Optional[str]
+    overall_status: Optional[str]
+    phases: List[str]
+    last_update_posted: Optional[str]
+    sponsor_class: str
+    study_url: Optional[str]
+    raw: Dict[str, Any]
+
+@dataclass(slots=True)
+class ExportRow:
+    """One scored account as handed to export.py; to_dict() keeps field order as key order."""
+    # Canonical keys used by export.py
+    account_name: str
+    fit: Optional[float]
+    urgency: Optional[float]
+    access: Optional[float]
+    total: Optional[float]
+    fit_reason: Optional[str]
+    urgency_reason: Optional[str]
+    urgency_source: Optional[str]
+    trigger_summary: str
+    best_fit_trial_title: Optional[str]
+    best_fit_trial_status: Optional[str]
+    best_fit_trial_phase: str
+    best_fit_trial_url: Optional[str]
+    best_urgency_trial_title: Optional[str]
+    best_urgency_trial_status: Optional[str]
+    best_urgency_trial_phase: str
+    best_urgency_trial_url: Optional[str]
+    sec: Optional[Dict[str, Any]]
+    patents: Optional[Dict[str, Any]]
+    target_roles: List[str]
+    # Backward compatible/debug keys
+    company: str
+    total_score: Optional[float]
+    fit_score: Optional[float]
+    urgency_score: Optional[float]
+    access_score: Optional[float]
+    evidence_links: List[str]
+    score_details: Optional[Dict[str, Any]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__}
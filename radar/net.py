@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def build_session(
+    pool_maxsize: int = 10,
+    retries: int = 3,
+    backoff_factor: float = 0.3,
+    accept: Optional[str] = None,
+    retry_methods: Optional[Iterable[str]] = None,
+) -> requests.Session:
+    """Keep-alive session with a pooled adapter and retries on transient HTTP errors.
+
+    raise_on_status=False hands the last response back once retries run out, so
+    callers keep using raise_for_status()/r.ok exactly as with a bare requests.get.
+    Accept-Encoding advertises every codec urllib3 can decode here (br/zstd too
+    when brotli/zstandard are installed), not just requests' gzip/deflate default.
+    retry_methods widens urllib3's idempotent-only default, for APIs whose POSTs
+    are plain queries.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS if retry_methods is None else frozenset(retry_methods),
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    s = requests.Session()
+    s.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    if accept:
+        s.headers["Accept"] = accept
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+class HostLimiter:
+    """Caps in-flight requests per host across threads, leaving other hosts unaffected.
+
+        with limiter.slot(url):
+            r = session.get(url)
+
+    429s that still happen are retried with backoff (and Retry-After) by the
+    session's Retry policy.
+    """
+
+    def __init__(self, per_host: int) -> None:
+        self.per_host = max(1, per_host)
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        sem = self._sems.get(host)
+        if sem is None:
+            with self._lock:
+                sem = self._sems.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        return sem
+
+class Throttle:
+    """Spaces request starts at least `delay_s` apart across all threads sharing it.
+
+    Unlike a plain sleep before each request, the request rate stays the same
+    however many threads are issuing requests.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self, delay_s: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + delay_s
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,69 @@
+"""Opt-in timing for the db and export helpers.
+
+RADAR_PROFILE=1 wraps every @profiled function in a perf_counter_ns timer;
+RADAR_PROFILE=mem also records each call's tracemalloc peak. Per-function
+totals are printed once at interpreter exit. With the variable unset,
+@profiled returns the function unchanged, so there is no per-call cost.
+"""
+from __future__ import annotations
+
+import atexit
+import functools
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, TypeVar
+
+_MODE = (os.environ.get("RADAR_PROFILE") or "").strip().lower()
+ENABLED = _MODE not in ("", "0")
+TRACE_MEMORY = _MODE == "mem"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# qualified name -> [calls, total_ns, max_ns, peak_bytes]
+_STATS: Dict[str, List[int]] = {}
+
+
+def profiled(fn: F) -> F:
+    """Time `fn` (and its allocation peak in mem mode) when RADAR_PROFILE is set.
+
+    Peaks are measured from the traced size at call entry, so profiled
+    functions should not call each other or the outer peak is cut short.
+    """
+    if not ENABLED:
+        return fn
+    st = _STATS.setdefault(f"{fn.__module__}.{fn.__qualname__}", [0, 0, 0, 0])
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if TRACE_MEMORY:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - t0
+            st[0] += 1
+            st[1] += elapsed
+            st[2] = max(st[2], elapsed)
+            if TRACE_MEMORY:
+                st[3] = max(st[3], tracemalloc.get_traced_memory()[1] - base)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def report() -> None:
+    """Print per-function totals, slowest first."""
+    rows = sorted(((k, v) for k, v in _STATS.items() if v[0]), key=lambda kv: kv[1][1], reverse=True)
+    for name, (calls, total, worst, peak) in rows:
+        line = f"[profile] {name}: calls={calls} total={total / 1e6:.2f}ms max={worst / 1e6:.2f}ms"
+        if TRACE_MEMORY:
+            line += f" peak={peak / 1024:.1f}KiB"
+        print(line)
+
+
+if ENABLED:
+    if TRACE_MEMORY:
+        tracemalloc.start()
+    atexit.register(report)
@@ -33,9 +33,14 @@ def recommend_roles(signals: List[Dict[str, Any]], max_roles: int = 5) -> List[s
       - signal payloads (best-effort)
     """
     txt = " ".join([(s.get("title") or "") for s in signals]).lower()
+    has_collaborator = any((s.get("signal_type") == "trial_collaborator") for s in signals)
+    return roles_for_text(txt, has_collaborator, max_roles=max_roles)
 
+def roles_for_text(txt: str, has_collaborator: bool, max_roles: int = 5) -> List[str]:
+    """recommend_roles() given the lower-cased, space-joined signal titles and whether
+    any signal is a trial collaboration; for callers that already walk the signals."""
     # Some signals imply external partnering/search & eval relevance
-    if any((s.get("signal_type") == "trial_collaborator") for s in signals):
+    if has_collaborator:
         txt += " external innovation search evaluation"
 
     role_keys: List[str] = []
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Sequence, Tuple
 import datetime as dt
 import math
+from functools import lru_cache
 from dateutil import parser as dateparser
 
+from radar import jsonutil
+from radar.textmatch import lowered_hits
+
 HIGH_URGENCY_STATUSES = {"RECRUITING", "NOT_YET_RECRUITING", "ACTIVE_NOT_RECRUITING"}
 
 def parse_date_maybe(s: str | None) -> dt.datetime | None:
@@ -25,16 +29,11 @@ def within_days(date_str: str | None, window_days: int) -> bool:
     now = dt.datetime.now(dt.timezone.utc)
     return (now - d).days <= window_days
 
-def _match_keywords(text: str, keywords: List[str]) -> List[str]:
-    t = (text or "").lower()
-    hits = []
-    for k in keywords:
-        kk = (k or "").lower()
-        if kk and kk in t:
-            hits.append(k)
-    return hits
+@lru_cache(maxsize=16)
+def _lowered_molecules(molecules: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((m, m.lower()) for m in molecules)
 
-def fit_from_trial_title(title: str | None, tcell_engager_molecules: List[str]) -> Tuple[int, str]:
+def fit_from_trial_title(title: str | None, tcell_engager_molecules: Sequence[str]) -> Tuple[int, str]:
     if not title:
         return 1, "missing title"
     t = title.lower()
@@ -42,8 +41,8 @@ def fit_from_trial_title(title: str | None, tcell_engager_molecules: List[str])
         return 5, "CAR-T trial"
     if "t-cell engager" in t or "t cell engager" in t or "cd3" in t or "bispecific" in t:
         return 4, "T cell engager / CD3 / bispecific trial"
-    for m in tcell_engager_molecules:
-        if m.lower() in t:
+    for m, ml in _lowered_molecules(tuple(tcell_engager_molecules)):
+        if ml in t:
             return 4, f"molecule match: {m}"
     if "cell therapy" in t or "tcr" in t:
         return 3, "cell therapy / TCR trial"
@@ -81,13 +80,12 @@ def other_signal_stats(signals: List[Dict[str, Any]], keywords: List[str], windo
         pj = s.get("payload_json")
         if pj:
             try:
-                import json as _json
-                blob = (_json.loads(pj) or {}).get("text_blob") or ""
+                blob = (jsonutil.loads(pj) or {}).get("text_blob") or ""
             except Exception:
                 blob = ""
         if not blob:
             blob = s.get("title") or ""
-        hits = _match_keywords(blob, keywords)
+        hits = lowered_hits(blob, keywords)
         if not hits:
             continue
         matched_total += 1
@@ -152,8 +150,8 @@ def compute_scores(
     best_fit = 0
     fit_reason = "no trials"
     best_fit_trial = None
+    mols = tuple((config.get("ctg", {}) or {}).get("tcell_engager_molecules", []))
     for t in trials[:50]:
-        mols = (config.get("ctg", {}) or {}).get("tcell_engager_molecules", [])
         s, reason = fit_from_trial_title(t.get("brief_title"), mols)
         if s > best_fit:
             best_fit = s
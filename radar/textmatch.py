@@ -0,0 +1,73 @@
+"""Keyword matching shared by the SEC and patent collectors and by scoring."""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import AbstractSet, List, Sequence, Tuple
+
+
+# ASCII byte -> lowercase alphanumeric or space; norm() is one translate + split on ASCII input.
+_NORM_TABLE = bytes(
+    (c | 0x20) if chr(c).isascii() and chr(c).isalpha() else c if 0x30 <= c <= 0x39 else 0x20
+    for c in range(256)
+)
+
+
+def norm(s: str) -> str:
+    """Lowercase and collapse every run of non-alphanumerics to a single space."""
+    s = s or ""
+    if s.isascii():
+        return b" ".join(s.encode("ascii").translate(_NORM_TABLE).split()).decode("ascii")
+    # str.lower() can map non-ASCII to ASCII (e.g. KELVIN SIGN -> "k"), so keep the regex path here.
+    s = s.lower()
+    s = re.sub(r"[^a-z0-9]+", " ", s)
+    return re.sub(r"\s+", " ", s).strip()
+
+
+@lru_cache(maxsize=64)
+def _normalized_keywords(keywords: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    # (original, normalized) pairs, built once per keyword list instead of per document.
+    return tuple((k, kk) for k in keywords if (kk := norm(k)))
+
+
+def keyword_hits(text: str, keywords: Sequence[str]) -> List[str]:
+    """Return the keywords (original spelling, config order) found in `text`.
+
+    Matching is substring-based on normalized text, so overlapping keywords such
+    as "car t" and "t cell engager" are all reported.
+    """
+    return normalized_hits(norm(text), keywords)
+
+
+def normalized_hits(t: str, keywords: Sequence[str], skip: AbstractSet[str] = frozenset()) -> List[str]:
+    """keyword_hits() for text that has already been through norm().
+
+    Keywords in `skip` (e.g. already found in an earlier piece of the same
+    document) are not searched for again.
+    """
+    return [k for k, kk in _normalized_keywords(tuple(keywords)) if k not in skip and kk in t]
+
+
+def matchable_keyword_count(keywords: Sequence[str]) -> int:
+    """Distinct keywords normalized_hits() can report; a scan that has found them all can stop."""
+    return len({k for k, _ in _normalized_keywords(tuple(keywords))})
+
+
+def max_keyword_len(keywords: Sequence[str]) -> int:
+    """Longest normalized keyword; the overlap needed when scanning text in pieces."""
+    return max((len(kk) for _, kk in _normalized_keywords(tuple(keywords))), default=0)
+
+
+@lru_cache(maxsize=64)
+def _lowered_keywords(keywords: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((k, kk) for k in keywords if (kk := (k or "").lower()))
+
+
+def lowered_hits(text: str, keywords: Sequence[str]) -> List[str]:
+    """Keywords (original spelling, config order) that occur in `text` case-insensitively.
+
+    Unlike keyword_hits(), the text is only lowercased, so punctuation matters:
+    "car-t" does not match "car t".
+    """
+    t = (text or "").lower()
+    return [k for k, kk in _lowered_keywords(tuple(keywords)) if kk in t]
@@ -3,7 +3,10 @@
  * Minimal Workday myworkdayjobs scraper (public CXS JSON).
  * - Discovers correct /wday/cxs/<tenant>/<site> tokens from landing page
  * - Falls back to provided tenant/site if discovery fails
- * - Fetches listings with A/B/C variants (GET params; POST searchText; POST query)
+ *   (--discover false --origin <url> skips discovery with tokens found earlier)
+ * - Fetches listings with A/B/C variants (GET params; POST searchText; POST query),
+ *   requesting the remaining pages (known from `total`, else speculatively) up to
+ *   --pageConcurrency at a time after the first
  * - Optionally fetches details for description
  *
  * Output: JSON array to stdout
@@ -23,27 +26,55 @@ function flag(name) {
   return process.argv.includes(`--${name}`);
 }
 
-async function getText(url) {
-  const res = await fetch(url, { headers: { "user-agent": UA, "accept": "text/html" } });
-  if (!res.ok) return null;
-  return { url: res.url, text: await res.text() };
-}
+// /wday/cxs/<tenant>/<site> as it appears in landing pages: plain, JSON-escaped
+// (\/wday\/cxs\/...), and the absolute forms of both. Compiled once at load.
+const CXS_TOKEN_PATTERNS = [
+  /\/wday\/cxs\/([^/]+)\/([^/"'?\s]+)/,
+  /\\\/wday\\\/cxs\\\/([^\\/]+)\\\/([^\\\"'?\s]+)/,
+  /https:\/\/[^\s"']+\/wday\/cxs\/([^/]+)\/([^/"'?\s]+)/,
+  /https:\\\/\\\/[^\s"']+\\\/wday\\\/cxs\\\/([^\\/]+)\\\/([^\\\"'?\s]+)/,
+];
 
 function extractTokens(html) {
-  // /wday/cxs/<tenant>/<site>
-  let m = html.match(/\/wday\/cxs\/([^/]+)\/([^/"'?\s]+)/);
-  if (m) return [m[1], m[2]];
-  // escaped: \/wday\/cxs\/<tenant>\/<site>
-  m = html.match(/\\\/wday\\\/cxs\\\/([^\\/]+)\\\/([^\\\"'?\s]+)/);
-  if (m) return [m[1], m[2]];
-  // absolute
-  m = html.match(/https:\/\/[^\s"']+\/wday\/cxs\/([^/]+)\/([^/"'?\s]+)/);
-  if (m) return [m[1], m[2]];
-  m = html.match(/https:\\\/\\\/[^\s"']+\\\/wday\\\/cxs\\\/([^\\/]+)\\\/([^\\\"'?\s]+)/);
-  if (m) return [m[1], m[2]];
+  for (const re of CXS_TOKEN_PATTERNS) {
+    const m = html.match(re);
+    if (m) return [m[1], m[2]];
+  }
   return null;
 }
 
+// Landing pages can be several hundred KB, but the CXS path normally shows up in
+// the first few. Read the body incrementally and stop once the plain pattern has
+// a complete match (it takes precedence in extractTokens, so the earliest match in
+// a prefix is the one a full read would return), or at the byte cap.
+const LANDING_MAX_BYTES = 512 * 1024;
+
+async function getLandingTokens(url) {
+  const res = await fetch(url, { headers: { "user-agent": UA, "accept": "text/html" } });
+  if (!res.ok) return null;
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let text = "";
+  let bytes = 0;
+  try {
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) {
+        text += decoder.decode();
+        break;
+      }
+      bytes += value.byteLength;
+      text += decoder.decode(value, { stream: true });
+      const m = text.match(CXS_TOKEN_PATTERNS[0]);
+      if (m && m.index + m[0].length < text.length) return { url: res.url, tokens: [m[1], m[2]] };
+      if (bytes >= LANDING_MAX_BYTES) break;
+    }
+  } finally {
+    reader.cancel().catch(() => {});
+  }
+  return { url: res.url, tokens: extractTokens(text) };
+}
+
 async function discover(host, site) {
   const candidates = [
     `https://${host}/${site}`,
@@ -51,10 +82,8 @@ async function discover(host, site) {
     `https://${host}/en-us/${site}`,
   ];
   for (const u of candidates) {
-    const got = await getText(u);
-    if (!got) continue;
-    const tokens = extractTokens(got.text);
-    if (tokens) return { tenant: tokens[0], site: tokens[1], origin: new URL(got.url).origin };
+    const got = await getLandingTokens(u);
+    if (got && got.tokens) return { tenant: got.tokens[0], site: got.tokens[1], origin: new URL(got.url).origin };
   }
   return null;
 }
@@ -93,6 +122,66 @@ async function getPage(listUrl, offset, limit, searchText) {
   throw new Error(`Workday jobs fetch failed HTTP ${best.status} ${listUrl} :: ${msg}`);
 }
 
+async function getPageSettled(listUrl, offset, limit, searchText) {
+  try {
+    return { page: await getPage(listUrl, offset, limit, searchText) };
+  } catch (err) {
+    return { err };
+  }
+}
+
+// Walk pages in order, consuming results with the same stop rules as a sequential
+// walk (empty or short page, maxPages) and dropping postings already seen by
+// externalPath. Pages fetched past the end are dropped; an
+// error only surfaces if the walk actually reaches that page.
+async function fetchAllPages(listUrl, pageSize, maxPages, searchText, concurrency) {
+  const jobs = [];
+  const seen = new Set();
+  let p = 0;
+  const consume = (results) => {
+    for (const r of results) {
+      if (r.err) throw r.err;
+      const postings = r.page.jobPostings ?? [];
+      p++;
+      if (!postings.length) return true;
+      // Postings shift across page boundaries when the board changes mid-walk.
+      for (const j of postings) {
+        const path = j.externalPath;
+        if (path) {
+          if (seen.has(path)) continue;
+          seen.add(path);
+        }
+        jobs.push(j);
+      }
+      if (postings.length < pageSize) return true;
+    }
+    return false;
+  };
+  const fetchPages = (count) => {
+    const offsets = Array.from({ length: Math.max(0, Math.min(count, maxPages - p)) }, (_, k) => (p + k) * pageSize);
+    return mapLimit(offsets, concurrency, (off) => getPageSettled(listUrl, off, pageSize, searchText));
+  };
+
+  if (maxPages <= 0) return jobs;
+  const first = await getPageSettled(listUrl, 0, pageSize, searchText);
+  if (consume([first])) return jobs;
+
+  // Workday reports `total` on the first page: fetch exactly the remaining pages in
+  // one bounded batch, then keep walking one page at a time in case postings were
+  // added meanwhile (the next page is normally empty).
+  const total = first.page.total;
+  let window = concurrency;
+  if (typeof total === "number" && total > 0) {
+    if (consume(await fetchPages(Math.ceil(total / pageSize) - 1))) return jobs;
+    window = 1;
+  }
+  // Otherwise speculate a window of pages at a time.
+  while (p < maxPages) {
+    if (consume(await fetchPages(window))) return jobs;
+  }
+  return jobs;
+}
+
 function detailUrl(origin, tenant, site, externalPath) {
   if (!externalPath || !externalPath.includes("/job/")) return null;
   const slug = externalPath.split("/job/")[1].replace(/^\/+/, "");
@@ -125,30 +214,24 @@ async function main() {
   const maxPages = parseInt(arg("maxPages", "20"), 10);
   const fetchDetails = arg("fetchDetails", "true") !== "false";
   const detailConcurrency = parseInt(arg("detailConcurrency", "6"), 10);
+  const doDiscover = arg("discover", "true") !== "false";
+  const originIn = arg("origin");
+  const pageConcurrency = Math.max(1, parseInt(arg("pageConcurrency", "4"), 10));
 
   if (!host || !tenantIn || !siteIn) {
     console.error("Missing required args: --host --tenant --site");
     process.exit(2);
   }
 
-  const discovered = await discover(host, siteIn);
+  const discovered = doDiscover ? await discover(host, siteIn) : null;
   const tenant = discovered?.tenant ?? tenantIn;
   const site = discovered?.site ?? siteIn;
-  const origin = discovered?.origin ?? `https://${host}`;
+  const origin = discovered?.origin ?? originIn ?? `https://${host}`;
 
   const base = `${origin}/wday/cxs/${tenant}/${site}`;
   const listUrl = `${base}/jobs`;
 
-  const jobs = [];
-  let offset = 0;
-  for (let p = 0; p < maxPages; p++) {
-    const page = await getPage(listUrl, offset, pageSize, searchText);
-    const postings = page.jobPostings ?? [];
-    if (!postings.length) break;
-    jobs.push(...postings);
-    if (postings.length < pageSize) break;
-    offset += pageSize;
-  }
+  const jobs = await fetchAllPages(listUrl, pageSize, maxPages, searchText, pageConcurrency);
 
   let details = [];
   if (fetchDetails) {
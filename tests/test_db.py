@@ -0,0 +1,37 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from radar import db
+
+
+class SignalOrderTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.conn = db.connect(Path(self._tmp.name) / "radar.sqlite")
+        db.migrate(self.conn)
+
+    def tearDown(self):
+        db.close(self.conn)
+        self._tmp.cleanup()
+
+    def test_ties_keep_per_row_timestamp_order(self):
+        # One batch shares created_at: undated signals tie on it and come latest
+        # insert first; dated ones sharing a published_at come oldest insert first.
+        with self.conn:
+            aid = db.upsert_account(self.conn, "Acme")
+            db.insert_signals_many(self.conn, [
+                (aid, "sec_filing", "sec_edgar", f"t{i}", f"https://example.com/{i}",
+                 None if i % 2 == 0 else "2025-01-01", {})
+                for i in range(6)
+            ])
+        expected = ["t4", "t2", "t0", "t1", "t3", "t5"]
+        self.assertEqual([s["title"] for s in db.get_signals_grouped(self.conn)[aid]], expected)
+        self.assertEqual([s["title"] for s in db.get_signals_for_account(self.conn, aid)], expected)
+        self.assertEqual(
+            [s["title"] for s in db.get_signals_for_account(self.conn, aid, signal_type="sec_filing")], expected
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
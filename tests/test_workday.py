@@ -0,0 +1,124 @@
+import unittest
+from unittest import mock
+
+from radar.collectors import workday
+
+LIST_URL = "https://acme.wd1.myworkdayjobs.com/wday/cxs/acme/ext/jobs"
+
+
+def _board(paths, with_total=True):
+    """A _get_page stand-in serving `paths` as postings; records the offsets asked for."""
+    calls = []
+
+    def get_page(list_url, offset, limit, search_text):
+        calls.append(offset)
+        page = {"jobPostings": [{"externalPath": p, "title": p} for p in paths[offset:offset + limit]]}
+        if with_total:
+            page["total"] = len(paths)
+        return page
+
+    return get_page, calls
+
+
+class FetchAllPagesTest(unittest.TestCase):
+    def _fetch(self, get_page, page_size=5, max_pages=20, concurrency=3):
+        with mock.patch.object(workday, "_get_page", get_page):
+            return workday._fetch_all_pages(LIST_URL, page_size, max_pages, "", concurrency)
+
+    def test_total_drives_remaining_pages_in_order(self):
+        paths = [f"/job/{i}" for i in range(23)]
+        get_page, calls = _board(paths)
+        jobs = self._fetch(get_page)
+        self.assertEqual([j["externalPath"] for j in jobs], paths)
+        self.assertEqual(sorted(calls), [0, 5, 10, 15, 20])
+
+    def test_without_total_walks_speculative_windows(self):
+        paths = [f"/job/{i}" for i in range(12)]
+        get_page, calls = _board(paths, with_total=False)
+        jobs = self._fetch(get_page)
+        self.assertEqual([j["externalPath"] for j in jobs], paths)
+        # Page 3 is short, so the walk stops after the first window.
+        self.assertEqual(sorted(calls), [0, 5, 10, 15])
+
+    def test_max_pages_caps_the_walk(self):
+        paths = [f"/job/{i}" for i in range(50)]
+        get_page, calls = _board(paths)
+        jobs = self._fetch(get_page, max_pages=3)
+        self.assertEqual([j["externalPath"] for j in jobs], paths[:15])
+        self.assertEqual(sorted(calls), [0, 5, 10])
+        self.assertEqual(self._fetch(get_page, max_pages=0), [])
+
+    def test_postings_shifted_across_pages_are_deduplicated(self):
+        # A posting added mid-walk pushes /job/4 onto the second page as well.
+        pages = {
+            0: ["/job/0", "/job/1", "/job/2", "/job/3", "/job/4"],
+            5: ["/job/4", "/job/5", "/job/6"],
+        }
+
+        def get_page(list_url, offset, limit, search_text):
+            return {"total": 8, "jobPostings": [{"externalPath": p} for p in pages.get(offset, [])]}
+
+        jobs = self._fetch(get_page)
+        self.assertEqual([j["externalPath"] for j in jobs], [f"/job/{i}" for i in range(7)])
+
+    def test_page_error_is_raised(self):
+        def get_page(list_url, offset, limit, search_text):
+            if offset:
+                raise RuntimeError("Workday jobs fetch failed HTTP 500")
+            return {"total": 10, "jobPostings": [{"externalPath": f"/job/{i}"} for i in range(5)]}
+
+        with self.assertRaises(RuntimeError):
+            self._fetch(get_page)
+
+
+class FetchDetailsTest(unittest.TestCase):
+    CTX = workday.WorkdayCtx.for_board("acme", "ext", "https://acme.wd1.myworkdayjobs.com")
+
+    def setUp(self):
+        workday._DETAILS.clear()
+        self.calls = []
+        self.responses = {}
+
+    def tearDown(self):
+        workday._DETAILS.clear()
+
+    def _fetch_json(self, url, method="GET", body=None):
+        self.calls.append(url)
+        status = self.responses[url.rsplit("/", 1)[1]]
+        ok = 200 <= status < 300
+        return ok, status, ({"jobPostingInfo": {"jobDescription": url}} if ok else None), ""
+
+    def _fetch(self, paths):
+        with mock.patch.object(workday, "_fetch_json", self._fetch_json):
+            return workday._fetch_details(self.CTX, paths, 4)
+
+    def test_gone_postings_are_cached_and_not_requested_again(self):
+        self.responses = {"a": 200, "b": 404, "c": 410}
+        paths = ["/job/a", "/job/b", "/job/c"]
+        out = self._fetch(paths)
+        self.assertEqual(list(out), ["/job/a"])
+        self.assertIs(workday._DETAILS[("acme", "ext", "/job/b")], workday._GONE)
+        self.assertIs(workday._DETAILS[("acme", "ext", "/job/c")], workday._GONE)
+
+        self.calls.clear()
+        self.assertEqual(self._fetch(paths), out)
+        self.assertEqual(self.calls, [])
+
+    def test_other_failures_are_retried(self):
+        self.responses = {"a": 503}
+        self.assertEqual(self._fetch(["/job/a"]), {})
+        self.assertNotIn(("acme", "ext", "/job/a"), workday._DETAILS)
+
+        self.responses = {"a": 200}
+        self.assertEqual(list(self._fetch(["/job/a"])), ["/job/a"])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_cache_evicts_oldest_past_max(self):
+        self.responses = {"a": 200, "b": 200, "c": 410}
+        with mock.patch.object(workday, "DETAIL_CACHE_MAX", 2):
+            self._fetch(["/job/a", "/job/b", "/job/c"])
+        self.assertEqual(list(workday._DETAILS), [("acme", "ext", "/job/b"), ("acme", "ext", "/job/c")])
+
+
+if __name__ == "__main__":
+    unittest.main()